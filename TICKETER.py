@@ -19,33 +19,84 @@ Enhanced with:
 8. ✅ Confirmation popup handling for "Ready" status
 """
 
+import io
 import os
+import re
+import sys
 import json
+import queue
+import hashlib
+import orjson
+import atexit
 import random
+import itertools
+import weakref
+import threading
 import traceback
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from collections import OrderedDict
+from functools import lru_cache
+from typing import BinaryIO, Callable, Dict, List, Any, NamedTuple, Optional, Tuple, Union
 from flask import Flask, request, jsonify, send_from_directory
 
 # ---------- LOGGING SETUP ----------
 import logging
+import logging.handlers
 
 # Create logs directory
 LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
 
-# Setup detailed logging
-log_filename = os.path.join(LOGS_DIR, f"ticketer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s] [%(funcName)s:%(lineno)d] %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# INFO by default; set LOG_LEVEL=DEBUG for step-by-step element tracing
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = '%(asctime)s [%(levelname)s] [%(funcName)s:%(lineno)d] %(message)s'
+
+# Kept in the environment so spawned parse workers log to the same file
+log_filename = os.environ.setdefault(
+    "TICKETER_LOG_FILE",
+    os.path.join(LOGS_DIR, f"ticketer_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"))
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _start_log_listener() -> None:
+    """
+    Route all records through a QueueHandler; a background QueueListener
+    does the formatting and file/console writes off the Selenium thread.
+    Also re-run in forked worker processes, which don't inherit the thread.
+    """
+    global _log_listener
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler(log_filename, encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    _log_listener.start()
+
+
+def _stop_log_listener() -> None:
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+_start_log_listener()
+atexit.register(_stop_log_listener)
+os.register_at_fork(after_in_child=_start_log_listener)
 logger = logging.getLogger(__name__)
 
 logger.info("="*80)
@@ -55,245 +106,723 @@ logger.info("="*80)
 # ---------- PDF PARSING ----------
 try:
     from pdfdata2 import extract as pdfdata2_extract
+    from pdfdata2 import extract_from_lines as pdfdata2_extract_lines
+    from pdfdata2 import fitz_page_lines, fitz
     logger.info("✓ pdfdata2 module loaded successfully")
+    if fitz is None:
+        logger.warning("⚠ PyMuPDF not installed, text pre-pass disabled")
 except ImportError:
     pdfdata2_extract = None
+    pdfdata2_extract_lines = None
+    fitz_page_lines = fitz = None
     logger.warning("⚠ pdfdata2 module not found, using fallback parser")
 
-from PyPDF2 import PdfReader
-
-PDF_UPLOAD_DIR = "uploads"
-os.makedirs(PDF_UPLOAD_DIR, exist_ok=True)
-
 SCREENSHOTS_DIR = "screenshots"
 os.makedirs(SCREENSHOTS_DIR, exist_ok=True)
 
 
+class InvoiceFields(NamedTuple):
+    """Normalized invoice fields ("." when missing)"""
+    name: str
+    surname: str
+    phone: str
+    invoice: str
+    cstcode: str
+    material: str
+    product: str
+    serial: str
+
+
 def ensure_dot(value: Any) -> str:
     """Convert value to string, return '.' if empty"""
     v = ("" if value is None else str(value)).strip()
     return v if v else "."
 
 
-def parse_pdf(path: str) -> Dict[str, str]:
+# A PDF given by path or as a seekable binary stream (e.g. an upload's f.stream)
+PdfSource = Union[str, BinaryIO]
+
+
+def read_pdf_lines(source: PdfSource, label: str) -> Optional[List[str]]:
     """
-    Uses pdfdata2.extract() to parse invoices.
-    Falls back to "." for missing fields.
+    Fast text-layer pass with PyMuPDF (pdfdata2.fitz_page_lines)
+    Returns None when PyMuPDF is unavailable or the file can't be opened
     """
-    logger.info(f"Parsing PDF: {path}")
+    if fitz is None:
+        return None
+    pages = fitz_page_lines(source)
+    if pages is None:
+        logger.warning(f"⚠ PyMuPDF could not read {label}")
+        return None
+    # Image-only pages (photo attachments) yield no lines
+    return [line for page in pages for line in page]
+
+
+def parse_pdf(source: PdfSource, label: Optional[str] = None) -> InvoiceFields:
+    """
+    Uses pdfdata2 to parse invoices, fed by a PyMuPDF text pre-pass.
+    Falls back to pdfminer layout parsing when the pre-pass misses key
+    fields, and to "." for missing fields.
+    `source` is a path or a seekable binary stream; `label` names it in logs.
+    """
+    label = label or (source if isinstance(source, str) else "<stream>")
+    logger.info(f"Parsing PDF: {label}")
+    
+    lines = read_pdf_lines(source, label)
+    if lines is not None and not lines:
+        logger.warning(f"⚠ No text layer found in {label} (scanned PDF?)")
     
+    raw: Dict[str, str] = {}
     if pdfdata2_extract is not None:
         try:
-            raw = pdfdata2_extract(path)
-            logger.debug(f"PDF parse result: {raw}")
+            if lines:
+                raw = pdfdata2_extract_lines(lines)
+            if lines is None or (lines and not (raw.get("invoice") and raw.get("name"))):
+                logger.debug("PyMuPDF pre-pass incomplete, using pdfminer layout parse")
+                raw = pdfdata2_extract(source, fast=False)
+            logger.debug("PDF parse result: %s", raw)
         except Exception as e:
             logger.error(f"PDF parsing failed: {e}")
-            logger.debug(traceback.format_exc())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             raw = {}
-    else:
-        raw = {}
-
-    result = {
-        "name": ensure_dot(raw.get("name")),
-        "surname": ensure_dot(raw.get("surname")),
-        "phone": ensure_dot(raw.get("phone")),
-        "invoice": ensure_dot(raw.get("invoice")),
-        "cstcode": ensure_dot(raw.get("cst code")),
-        "material": ensure_dot(raw.get("material")),
-        "product": ensure_dot(raw.get("product")),
-        "serial": ensure_dot(raw.get("serial")),
-    }
+
+    result = InvoiceFields(
+        name=ensure_dot(raw.get("name")),
+        surname=ensure_dot(raw.get("surname")),
+        phone=ensure_dot(raw.get("phone")),
+        invoice=ensure_dot(raw.get("invoice")),
+        cstcode=ensure_dot(raw.get("cst code")),
+        material=ensure_dot(raw.get("material")),
+        product=ensure_dot(raw.get("product")),
+        serial=ensure_dot(raw.get("serial")),
+    )
     
     logger.info(f"✓ PDF parsed successfully: {result}")
     return result
 
 
+def available_cpus() -> int:
+    """CPUs this process may run on (the affinity mask, not the host count)"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Parsing is CPU-bound: uploads are spread over a process pool kept across requests
+PARSE_WORKERS = max(1, int(os.environ.get("PARSE_WORKERS", min(available_cpus(), 4))))
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_lock = threading.Lock()
+
+
+def _parse_one(data: bytes, label: str) -> InvoiceFields:
+    """Process-pool task: parse one PDF from its raw bytes"""
+    return parse_pdf(io.BytesIO(data), label)
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # spawn, not fork: the pool starts from a request thread while the log
+            # listener, screenshot writer and Selenium clients may hold locks
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            logger.info(f"✓ PDF parse pool started with {PARSE_WORKERS} workers")
+        return _parse_executor
+
+
+def shutdown_parse_executor() -> None:
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is not None:
+            _parse_executor.shutdown(wait=True, cancel_futures=True)
+            _parse_executor = None
+
+
+atexit.register(shutdown_parse_executor)
+
+
+# Parsed fields by sha256 of the PDF bytes: re-uploading a file is free
+PARSE_CACHE_SIZE = int(os.environ.get("PARSE_CACHE_SIZE", "256"))
+_parse_cache: "OrderedDict[str, InvoiceFields]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _parse_uncached(uploads: List[Tuple[str, bytes]]) -> List[InvoiceFields]:
+    """Parse (label, bytes) uploads, in input order"""
+    if PARSE_WORKERS > 1 and len(uploads) > 1:
+        try:
+            executor = get_parse_executor()
+            futures = [executor.submit(_parse_one, data, label) for label, data in uploads]
+            return [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            logger.error(f"✗ PDF parse pool crashed, parsing serially: {e}")
+            shutdown_parse_executor()
+    return [_parse_one(data, label) for label, data in uploads]
+
+
+def parse_pdf_batch(uploads: List[Tuple[str, bytes]]) -> List[InvoiceFields]:
+    """
+    Parse (label, bytes) uploads, in input order
+    Files seen before (same bytes) come from the cache; the rest go to the
+    process pool for more than one file, parsing serially if it breaks
+    """
+    digests = [hashlib.sha256(data).hexdigest() for _, data in uploads]
+    results: Dict[str, InvoiceFields] = {}
+    with _parse_cache_lock:
+        for digest in digests:
+            if digest in _parse_cache:
+                _parse_cache.move_to_end(digest)
+                results[digest] = _parse_cache[digest]
+
+    # Parse each missing file once, even if it was uploaded twice in this batch
+    pending: Dict[str, Tuple[str, bytes]] = {}
+    for digest, upload in zip(digests, uploads):
+        if digest not in results and digest not in pending:
+            pending[digest] = upload
+    if len(pending) < len(uploads):
+        logger.info(f"✓ {len(uploads) - len(pending)} PDF(s) served from the parse cache")
+
+    if pending:
+        parsed = _parse_uncached(list(pending.values()))
+        with _parse_cache_lock:
+            for digest, fields in zip(pending, parsed):
+                results[digest] = _parse_cache[digest] = fields
+                _parse_cache.move_to_end(digest)
+            while len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+
+    return [results[digest] for digest in digests]
+
+
 # ---------- SELENIUM / PMM AUTOMATION ----------
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 # Railway-compatible Selenium setup
-from selenium_setup import get_driver_from_env
+from selenium_setup import BrowserPool, navigate
 from selenium.common.exceptions import (
     TimeoutException,
     ElementClickInterceptedException,
     NoSuchElementException,
-    StaleElementReferenceException
+    StaleElementReferenceException,
+    JavascriptException
 )
 
 PMM_BASE_URL = "https://pmm.irepair.gr"
 COOKIES_FILE = "pmm_cookies.json"
 
-# Configuration constants
-VISIBLE_DAMAGE_OPTIONS = [
+# Phone normalization: drop spaces/dashes in one pass, then require ASCII digits
+_PHONE_STRIP = str.maketrans("", "", " -")
+_PHONE_DIGITS_RE = re.compile(r"[0-9]+")
+
+# Login form fields fetched together by ELEMENTS_BY_ID_JS
+LOGIN_FIELD_IDS = ["username", "password-field", "authenticator_type_2"]
+
+# Login form submit candidates; a button with one of the labels is preferred
+LOGIN_BUTTON_SELECTOR = "button[type='submit'], input[type='submit'], form button:not([type])"
+LOGIN_BUTTON_LABELS = ("login", "log in", "sign in", "submit", "")
+
+# Save button shared by the add/edit ticket forms
+SAVE_BUTTON_SELECTOR = "button[name='btn_save'][type='submit']"
+
+# "Yes, do it!" button of the confirmation popup shown for "Ready" status
+CONFIRM_POPUP_SELECTOR = "button.confirm"
+CONFIRM_POPUP_TIMEOUT_MS = 2500
+
+# Async: resolves with the first visible popup button (arguments[0]) as soon as it
+# is shown, or null after arguments[1] ms - one observer instead of polling
+WAIT_FOR_POPUP_JS = """
+const sel = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const visible = () => Array.from(document.querySelectorAll(sel))
+    .find(b => b.offsetParent !== null && !b.disabled) || null;
+const hit = visible();
+if (hit) { done(hit); return; }
+const mo = new MutationObserver(() => {
+    const btn = visible();
+    if (btn) { mo.disconnect(); clearTimeout(timer); done(btn); }
+});
+const timer = setTimeout(() => { mo.disconnect(); done(null); }, timeoutMs);
+mo.observe(document.body, {subtree: true, childList: true, attributes: true,
+                           attributeFilter: ['class', 'style']});
+"""
+
+# Map status names to match the ticketstatusID option text exactly
+STATUS_NAME_MAP = {
+    "With Technician": "With Technician",
+    "In House Repair": "In-house Repair",  # Fixed: Added dash
+    "In-house Repair": "In-house Repair",
+    "Final Check": "Final Check",
+    "Ready": "Ready for Pickup",  # Fixed: Full name
+    "Ready for Pickup": "Ready for Pickup",
+    "Closed": "Closed"
+}
+
+# Status progression after a ticket is created (names match the HTML exactly)
+STATUS_FLOW = (
+    "With Technician",
+    "In-house Repair",  # ← FIXED: Added dash to match HTML
+    "Final Check",
+    "Ready for Pickup",  # ← FIXED: Full name from HTML
+    "Closed",
+)
+
+# Sets ticketstatusID to `value`, fires change and PMM's auto-save for
+# `ticketId`, then returns the value the select ended up with (run via cdp_call)
+SET_STATUS_FN = """
+function (value, ticketId) {
+    var s = document.getElementById('ticketstatusID');
+    s.value = value;
+    s.dispatchEvent(new Event('change', {bubbles: true}));
+    if (typeof fun_save_ticket_status === 'function') {
+        fun_save_ticket_status(value, ticketId);
+    }
+    return s.value;
+}
+"""
+
+# Sets the assign_to select (arguments[0]) to arguments[1], fires input/change
+# and PMM's assign hook, then returns the applied value
+ASSIGN_TECHNICIAN_JS = """
+var s = arguments[0];
+s.value = arguments[1];
+s.dispatchEvent(new Event('input', {bubbles: true}));
+s.dispatchEvent(new Event('change', {bubbles: true}));
+if (typeof fun_save_ticket_assign_to === 'function') {
+    fun_save_ticket_assign_to();
+}
+return s.value;
+"""
+
+# Ticket ID from the hidden ticketID input, or from /edittickets/<id> in the URL
+TICKET_ID_FN = (
+    "function () { var e = document.getElementById('ticketID');"
+    "return (e && e.value) || (location.pathname.match(/\\/edittickets\\/(\\d+)/) || [])[1] || null; }"
+)
+_TICKET_ID_URL_RE = re.compile(r'/edittickets/(\d+)')
+
+# Page is idle once no jQuery request is in flight and the document has loaded
+AJAX_IDLE_JS = (
+    "return (!window.jQuery || jQuery.active === 0)"
+    " && document.readyState === 'complete';"
+)
+BLOCKUI_OVERLAY_SELECTOR = "div.blockUI.blockOverlay"
+
+# Async: resolves true as soon as no element matching arguments[0] is rendered,
+# or false after arguments[1] ms (getClientRects also covers position:fixed overlays)
+WAIT_GONE_JS = """
+const sel = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+const shown = () => Array.from(document.querySelectorAll(sel)).some(e => e.getClientRects().length > 0);
+if (!shown()) { done(true); return; }
+const mo = new MutationObserver(() => {
+    if (!shown()) { mo.disconnect(); clearTimeout(timer); done(true); }
+});
+const timer = setTimeout(() => { mo.disconnect(); done(false); }, timeoutMs);
+mo.observe(document.body, {subtree: true, childList: true, attributes: true,
+                           attributeFilter: ['class', 'style']});
+"""
+# Upper bound for execute_async_script; in-page waits resolve on their own timers first
+SCRIPT_TIMEOUT = 60
+
+# True once location.pathname contains arguments[0] (a boolean instead of the full URL)
+PATH_CONTAINS_JS = "return location.pathname.indexOf(arguments[0]) !== -1;"
+# Poll interval for page-transition waits (Selenium's default is 0.5s)
+FAST_POLL_SECONDS = 0.1
+
+# Sets value on each input id in arguments[0] (dropping readonly), fires input/change,
+# and returns the ids that were not found
+FILL_FIELDS_JS = """
+const missing = [];
+for (const [id, v] of Object.entries(arguments[0])) {
+    const el = document.getElementById(id);
+    if (!el) { missing.push(id); continue; }
+    el.removeAttribute('readonly');
+    el.value = v;
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return missing;
+"""
+
+# Selects the option of <select id=arguments[0]> whose trimmed text (or value if
+# arguments[2]) equals arguments[1] and fires change; native events also reach
+# jQuery/Select2 handlers. Returns false when no option matches.
+SET_SELECT_JS = """
+const s = document.getElementById(arguments[0]), wanted = arguments[1], byValue = arguments[2];
+if (!s) return false;
+const opt = Array.from(s.options).find(o => (byValue ? o.value : o.text.trim()) === wanted);
+if (!opt) return false;
+s.value = opt.value;
+s.dispatchEvent(new Event('change', {bubbles: true}));
+return true;
+"""
+
+# Maps each id in arguments[0] to its element (or null) in one round-trip
+ELEMENTS_BY_ID_JS = """
+var r = {};
+for (const id of arguments[0]) { r[id] = document.getElementById(id); }
+return r;
+"""
+
+# Reads every <option> of arguments[0] as [value, trimmed text, selected]
+SELECT_OPTIONS_JS = (
+    "return Array.from(arguments[0].options)"
+    ".map(o => [o.value, o.text.trim(), o.selected]);"
+)
+
+
+# Configuration constants (immutable; members interned for cheap compares/hashing)
+def _options(*values: str) -> Tuple[str, ...]:
+    return tuple(sys.intern(v) for v in values)
+
+
+VISIBLE_DAMAGE_OPTIONS = _options(
     "light signs of use",
     "brand new",
     "some scratches",
     "hits on frame",
-]
+)
 
-ITEMS_LEFT_OPTIONS = [
+ITEMS_LEFT_OPTIONS = _options(
     "only device left with us",
     "full box device left with us",
-]
+)
 
-PROMO_OPTIONS = [
+PROMO_OPTIONS = _options(
     "promo setup & optimization",
     "software optimization and account setup",
     "promo service – data check & configuration",
     "promo device setup and update",
-]
+)
 
-PRINTER_PROBLEMS = [
+PRINTER_PROBLEMS = _options(
     "printer not printing",
     "paper jam randomly",
     "printer offline on network",
     "lines / streaks on prints",
-]
+)
 
-LAPTOP_PROBLEMS = [
+LAPTOP_PROBLEMS = _options(
     "slow performance and freezes",
     "random shutdowns while in use",
     "blue screen errors",
     "overheating under light usage",
-]
+)
 
-TABLET_PROBLEMS = [
+TABLET_PROBLEMS = _options(
     "touchscreen not responsive",
     "battery drains quickly",
     "tablet not charging",
     "apps crashing frequently",
-]
+)
 
-APPLIANCE_PROBLEMS = [
+APPLIANCE_PROBLEMS = _options(
     "device not powering on",
     "random error codes displayed",
     "unusual noise during operation",
     "device stops mid-cycle",
-]
+)
 
-PHONE_PROBLEMS = [
+PHONE_PROBLEMS = _options(
     "screen flickering and ghost touches",
     "device restarting randomly",
     "battery drains very fast",
     "no sound on calls",
     "camera not focusing",
-]
+)
 
-ETA_OPTIONS = [
+ETA_OPTIONS = _options(
     "ETA: same day service if possible.",
     "ETA: 1 business day.",
     "ETA: 2–3 business days.",
-]
+)
 
-PROMO_RESOLUTION_OPTIONS = [
+PROMO_RESOLUTION_OPTIONS = _options(
     "setup done",
     "ready",
     "setup finished",
     "finished setting up",
     "cst informed",
-]
+)
 
-NORMAL_RESOLUTION_OPTIONS = [
+NORMAL_RESOLUTION_OPTIONS = _options(
     "device works fine",
     "device ok cst informed",
     "no issues",
     "no problem",
     "works fine",
-]
+)
 
 
-@dataclass
+# Short "items left" values for the ticket field and repair description
+_ITEMS_LEFT = _options("only device", "full box device")
+
+# Per-ticket variety without the RNG: damage/items-left rotate through their options
+_DAMAGE_CYCLE = itertools.cycle(VISIBLE_DAMAGE_OPTIONS)
+_ITEMS_LEFT_CYCLE = itertools.cycle(_ITEMS_LEFT)
+_cycle_lock = threading.Lock()
+
+
+def next_option(cycle: "itertools.cycle[str]") -> str:
+    """Next value of an option cycle (shared by the batch worker threads)"""
+    with _cycle_lock:
+        return next(cycle)
+
+
+# Ticket type -> problem/resolution pools
+_PROBLEM_POOLS: Dict[str, Tuple[str, ...]] = {
+    "PROMO": PROMO_OPTIONS,
+    "QUICK REPAIR PRINTER": PRINTER_PROBLEMS,
+    "QUICK REPAIR LAPTOP": LAPTOP_PROBLEMS,
+    "QUICK REPAIR TABLET": TABLET_PROBLEMS,
+    "QUICK REPAIR APPLIANCE": APPLIANCE_PROBLEMS,
+}
+_RES_POOLS: Dict[str, Tuple[str, ...]] = {
+    "PROMO": PROMO_RESOLUTION_OPTIONS,
+}
+
+
+@dataclass(slots=True, frozen=True)
 class ParsedInvoice:
     id: str
     filename: str
-    path: str
-    fields: Dict[str, str]
+    fields: InvoiceFields
+
+
+# Parsed invoices by id, least recently used first; capped at MAX_PARSED_CACHE
+# entries and shared by concurrent Flask requests, so guarded by an RLock
+MAX_PARSED_CACHE = 512
+parsed_files: "OrderedDict[str, ParsedInvoice]" = OrderedDict()
+_parsed_lock = threading.RLock()
+
+
+def remember_parsed(parsed: ParsedInvoice) -> None:
+    """Store a parsed invoice, evicting the least recently used over the cap"""
+    with _parsed_lock:
+        parsed_files.pop(parsed.id, None)
+        parsed_files[parsed.id] = parsed
+        while len(parsed_files) > MAX_PARSED_CACHE:
+            parsed_files.popitem(last=False)
 
 
-parsed_files: Dict[str, ParsedInvoice] = {}
+def get_parsed(file_id: str) -> Optional[ParsedInvoice]:
+    with _parsed_lock:
+        parsed = parsed_files.get(file_id)
+        if parsed is not None:
+            parsed_files.move_to_end(file_id)
+        return parsed
+
+
+def clear_parsed() -> None:
+    """Forget every parsed invoice before a new upload"""
+    with _parsed_lock:
+        parsed_files.clear()
+
+
+# Screenshots are captured on the Selenium thread but written to disk by a
+# background writer; when the queue is full the oldest pending one is dropped
+SCREENSHOT_QUEUE_SIZE = 16
+_ss_q: "queue.Queue[Tuple[bytes, str]]" = queue.Queue(maxsize=SCREENSHOT_QUEUE_SIZE)
+
+
+def _write_screenshot(png: bytes, filepath: str) -> None:
+    try:
+        with open(filepath, "wb") as f:
+            f.write(png)
+        logger.info(f"📸 Screenshot saved: {filepath}")
+    except Exception as e:
+        logger.error(f"Failed to write screenshot {filepath}: {e}")
+
+
+def _screenshot_worker() -> None:
+    while True:
+        png, filepath = _ss_q.get()
+        _write_screenshot(png, filepath)
+
+
+def _start_screenshot_writer() -> None:
+    """Start the writer thread (re-run in forked workers, which lose it)"""
+    global _ss_q
+    _ss_q = queue.Queue(maxsize=SCREENSHOT_QUEUE_SIZE)
+    threading.Thread(target=_screenshot_worker, name="screenshot-writer", daemon=True).start()
+
+
+def _drain_screenshots() -> None:
+    """Write any screenshots still queued at shutdown"""
+    while True:
+        try:
+            png, filepath = _ss_q.get_nowait()
+        except queue.Empty:
+            return
+        _write_screenshot(png, filepath)
+
+
+_start_screenshot_writer()
+atexit.register(_drain_screenshots)
+os.register_at_fork(after_in_child=_start_screenshot_writer)
 
 
 def save_screenshot(driver: webdriver.Chrome, prefix: str) -> str:
-    """Save screenshot with timestamp"""
+    """Capture screenshot with timestamp; the file is written asynchronously"""
     try:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         filename = f"{prefix}_{timestamp}.png"
         filepath = os.path.join(SCREENSHOTS_DIR, filename)
-        driver.save_screenshot(filepath)
-        logger.info(f"📸 Screenshot saved: {filepath}")
-        return filepath
+        png = driver.get_screenshot_as_png()
     except Exception as e:
         logger.error(f"Failed to save screenshot: {e}")
         return ""
 
+    while True:
+        try:
+            _ss_q.put_nowait((png, filepath))
+            break
+        except queue.Full:
+            try:
+                _, dropped = _ss_q.get_nowait()
+                logger.warning(f"⚠ Screenshot queue full, dropped {dropped}")
+            except queue.Empty:
+                pass
+    return filepath
+
+
+# Failure tags noted on the current thread while a ticket runs; a screenshot is
+# only taken once the ticket (or login) is actually abandoned
+_failure_ctx = threading.local()
+MAX_FAILURE_TAGS = 3
+
+
+def note_failure(tag: str) -> None:
+    """Record an intermediate failure for the next terminal screenshot"""
+    tags = getattr(_failure_ctx, "tags", None)
+    if tags is None:
+        tags = _failure_ctx.tags = []
+    tags.append(tag)
+
+
+def take_failure_tags() -> List[str]:
+    """Return and reset the failure tags of the current thread"""
+    tags = getattr(_failure_ctx, "tags", None) or []
+    _failure_ctx.tags = []
+    return tags
+
+
+def screenshot_failure(driver: webdriver.Chrome, default: str) -> str:
+    """Single screenshot for an abandoned ticket, named after its last failure tags"""
+    tags = take_failure_tags()
+    return save_screenshot(driver, "_".join(tags[-MAX_FAILURE_TAGS:]) or default)
+
+
+@lru_cache(maxsize=64)
+def _problem_pool(ticket_type: str) -> Tuple[str, ...]:
+    # default to phone variant
+    return _PROBLEM_POOLS.get(ticket_type.upper().strip(), PHONE_PROBLEMS)
+
+
+@lru_cache(maxsize=64)
+def _resolution_pool(ticket_type: str) -> Tuple[str, ...]:
+    return _RES_POOLS.get(ticket_type.upper().strip(), NORMAL_RESOLUTION_OPTIONS)
+
 
 def build_repair_description(ticket_type: str, items_left_text: str) -> str:
     """Build repair description based on ticket type"""
-    ticket_type = ticket_type.upper().strip()
-    logger.debug(f"Building repair description for ticket type: {ticket_type}")
+    logger.debug("Building repair description for ticket type: %s", ticket_type)
     
-    if ticket_type == "PROMO":
-        problem = random.choice(PROMO_OPTIONS)
-    elif ticket_type == "QUICK REPAIR PRINTER":
-        problem = random.choice(PRINTER_PROBLEMS)
-    elif ticket_type == "QUICK REPAIR LAPTOP":
-        problem = random.choice(LAPTOP_PROBLEMS)
-    elif ticket_type == "QUICK REPAIR TABLET":
-        problem = random.choice(TABLET_PROBLEMS)
-    elif ticket_type == "QUICK REPAIR APPLIANCE":
-        problem = random.choice(APPLIANCE_PROBLEMS)
-    else:
-        # default to phone variant
-        problem = random.choice(PHONE_PROBLEMS)
-
+    # Only the pool lookup is cached - the pick itself stays random per ticket
+    problem = random.choice(_problem_pool(ticket_type))
     eta = random.choice(ETA_OPTIONS)
     description = f"{items_left_text}. {problem}. {eta}"
-    logger.debug(f"Repair description: {description}")
+    logger.debug("Repair description: %s", description)
     return description
 
 
 def build_resolution(ticket_type: str) -> str:
     """Build resolution text based on ticket type"""
-    ticket_type = ticket_type.upper().strip()
-    if ticket_type == "PROMO":
-        return random.choice(PROMO_RESOLUTION_OPTIONS)
-    return random.choice(NORMAL_RESOLUTION_OPTIONS)
+    return random.choice(_resolution_pool(ticket_type))
+
+
+# In-memory copy of the session cookies; disk is only touched on first load
+# and by a background flush after they change
+_COOKIES_CACHE: Optional[List[Dict[str, Any]]] = None
+_COOKIES_DIRTY: bool = False
+_cookies_lock = threading.Lock()
+
+
+def _flush_cookies() -> None:
+    """Write cached cookies to COOKIES_FILE if they changed since the last flush"""
+    global _COOKIES_DIRTY
+    with _cookies_lock:
+        if not _COOKIES_DIRTY:
+            return
+        try:
+            with open(COOKIES_FILE, "wb") as f:
+                f.write(orjson.dumps(_COOKIES_CACHE, option=orjson.OPT_INDENT_2))
+            _COOKIES_DIRTY = False
+            logger.info(f"✓ Cookies saved to {COOKIES_FILE}")
+        except Exception as e:
+            logger.error(f"Failed to save cookies: {e}")
+
+
+atexit.register(_flush_cookies)
 
 
 def save_cookies(driver: webdriver.Chrome) -> None:
-    """Save cookies to file for session persistence"""
+    """Save cookies for session persistence (cached in memory, flushed async)"""
+    global _COOKIES_CACHE, _COOKIES_DIRTY
     try:
         cookies = driver.get_cookies()
-        with open(COOKIES_FILE, "w", encoding="utf-8") as f:
-            json.dump(cookies, f, ensure_ascii=False, indent=2)
-        logger.info(f"✓ Cookies saved to {COOKIES_FILE}")
     except Exception as e:
         logger.error(f"Failed to save cookies: {e}")
+        return
+
+    with _cookies_lock:
+        if cookies == _COOKIES_CACHE:
+            logger.debug("Cookies unchanged, skipping save")
+            return
+        _COOKIES_CACHE = cookies
+        _COOKIES_DIRTY = True
+    threading.Thread(target=_flush_cookies, daemon=True).start()
 
 
 def load_cookies(driver: webdriver.Chrome) -> None:
-    """Load cookies from file"""
-    if not os.path.exists(COOKIES_FILE):
-        logger.info("No cookies file found, will perform fresh login")
+    """Load cookies from the in-memory cache, reading COOKIES_FILE on first use"""
+    global _COOKIES_CACHE
+    cookies = _COOKIES_CACHE
+    
+    if cookies is None:
+        if not os.path.exists(COOKIES_FILE):
+            logger.info("No cookies file found, will perform fresh login")
+            _COOKIES_CACHE = []
+            return
+        try:
+            with open(COOKIES_FILE, "rb") as f:
+                cookies = orjson.loads(f.read())
+        except Exception as e:
+            logger.error(f"Failed to load cookies: {e}")
+            return
+        with _cookies_lock:
+            if _COOKIES_CACHE is None:
+                _COOKIES_CACHE = cookies
+    
+    if not cookies:
+        logger.info("No saved cookies, will perform fresh login")
         return
     
     try:
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            cookies = json.load(f)
-        
-        logger.info(f"Loading {len(cookies)} cookies from file")
-        driver.get(PMM_BASE_URL)
+        logger.info(f"Loading {len(cookies)} cookies")
+        navigate(driver, PMM_BASE_URL)
         
         for c in cookies:
-            c.pop('sameSite', None)
+            c = {k: v for k, v in c.items() if k != 'sameSite'}
             try:
                 driver.add_cookie(c)
             except Exception as e:
-                logger.debug(f"Could not add cookie {c.get('name')}: {e}")
+                logger.debug("Could not add cookie %s: %s", c.get('name'), e)
                 continue
         
         logger.info("✓ Cookies loaded successfully")
@@ -301,17 +830,73 @@ def load_cookies(driver: webdriver.Chrome) -> None:
         logger.error(f"Failed to load cookies: {e}")
 
 
+def default_worker_count() -> int:
+    """Worker count from TICKETER_WORKERS, else half the available CPUs"""
+    env_value = os.environ.get("TICKETER_WORKERS", "").strip()
+    if env_value:
+        return max(1, int(env_value))
+    return max(1, available_cpus() // 2)
+
+
+TICKETER_WORKERS = default_worker_count()
+
+# One Chrome per worker thread by default, so parallel batches never queue on the pool
+POOL = BrowserPool(int(os.environ.get("POOL_SIZE", TICKETER_WORKERS)), script_timeout=SCRIPT_TIMEOUT)
+atexit.register(POOL.drain)
+
+
 def get_driver() -> webdriver.Chrome:
-    """Initialize Chrome WebDriver with Railway-compatible setup"""
-    logger.info("Initializing Chrome WebDriver...")
+    """Get a Chrome WebDriver from the shared pool"""
+    logger.info("Acquiring Chrome WebDriver from pool...")
     
-    # Use the Railway-compatible driver from selenium_setup
-    driver = get_driver_from_env()
+    # Pooled drivers are created with the Railway-compatible selenium_setup
+    driver = POOL.acquire()
     
-    logger.info("✓ Chrome WebDriver initialized successfully")
+    logger.info("✓ Chrome WebDriver ready")
     return driver
 
 
+# Pooled driver -> (CRM username, monotonic time of last login check)
+_driver_logins: "weakref.WeakKeyDictionary[webdriver.Chrome, Tuple[str, float]]" = (
+    weakref.WeakKeyDictionary()
+)
+LOGIN_REVALIDATE_SECONDS = 600
+# Serializes logins so parallel workers reuse the cookies saved by the first one
+# instead of each going through CAPTCHA/OTP
+_login_lock = threading.Lock()
+
+
+def acquire_driver(crm_username: str, crm_password: str) -> webdriver.Chrome:
+    """
+    Get a pooled driver that is logged in as `crm_username`
+    Login only runs for fresh drivers, a different user, or a stale session check
+    """
+    driver = get_driver()
+    login = _driver_logins.get(driver)
+    if (login is not None and login[0] == crm_username
+            and time.monotonic() - login[1] < LOGIN_REVALIDATE_SECONDS):
+        logger.info(f"✓ Reusing session logged in as {crm_username}")
+        return driver
+
+    take_failure_tags()
+    try:
+        with _login_lock:
+            login_if_needed(driver, crm_username, crm_password)
+    except Exception:
+        screenshot_failure(driver, "login_failed")
+        _driver_logins.pop(driver, None)
+        POOL.release(driver)
+        raise
+    _driver_logins[driver] = (crm_username, time.monotonic())
+    return driver
+
+
+def release_driver(driver: webdriver.Chrome) -> None:
+    """Return a logged-in driver to the pool, keeping its session cookies"""
+    logger.info("Returning browser to pool...")
+    POOL.release(driver, reset=False)
+
+
 def wait_for_element(driver: webdriver.Chrome, by: By, value: str, 
                      timeout: int = 30, condition="presence") -> Any:
     """
@@ -320,9 +905,9 @@ def wait_for_element(driver: webdriver.Chrome, by: By, value: str,
     Args:
         condition: "presence", "visible", "clickable"
     """
-    logger.debug(f"Waiting for element: {by}={value} (condition: {condition}, timeout: {timeout}s)")
+    logger.debug("Waiting for element: %s=%s (condition: %s, timeout: %ss)", by, value, condition, timeout)
     
-    wait = WebDriverWait(driver, timeout)
+    wait = WebDriverWait(driver, timeout, poll_frequency=FAST_POLL_SECONDS)
     
     try:
         if condition == "presence":
@@ -334,20 +919,67 @@ def wait_for_element(driver: webdriver.Chrome, by: By, value: str,
         else:
             raise ValueError(f"Unknown condition: {condition}")
         
-        logger.debug(f"✓ Element found: {by}={value}")
+        logger.debug("✓ Element found: %s=%s", by, value)
         return element
     
     except TimeoutException:
         logger.error(f"✗ Timeout waiting for element: {by}={value}")
-        save_screenshot(driver, f"timeout_{by}_{value[:30]}")
+        note_failure(f"timeout_{by}_{value[:30]}")
         raise
 
 
+def wait_blockui_gone(driver: webdriver.Chrome, timeout: int = 30) -> bool:
+    """
+    Wait for the blockUI overlay to disappear, resolving on the DOM mutation itself
+    Returns False if it is still shown after `timeout` seconds
+    """
+    return bool(driver.execute_async_script(
+        WAIT_GONE_JS, BLOCKUI_OVERLAY_SELECTOR, int(min(timeout, SCRIPT_TIMEOUT - 1) * 1000)
+    ))
+
+
+def wait_for_ajax_idle(driver: webdriver.Chrome, timeout: int = 15) -> bool:
+    """
+    Wait until the blockUI overlay is gone and jQuery has no pending requests
+    Returns False (without raising) if the page is still busy after `timeout`
+    """
+    wait = WebDriverWait(driver, timeout, poll_frequency=FAST_POLL_SECONDS)
+    try:
+        if not wait_blockui_gone(driver, timeout):
+            raise TimeoutException("blockUI overlay still shown")
+        wait.until(lambda d: d.execute_script(AJAX_IDLE_JS))
+        return True
+    except TimeoutException:
+        logger.warning(f"⚠ Page still busy after {timeout}s, continuing anyway")
+        return False
+
+
+def cdp_eval(driver: webdriver.Chrome, expression: str) -> Any:
+    """
+    Evaluate a JS expression through CDP Runtime.evaluate
+    Skips the WebDriver execute_script argument/element marshaling
+    """
+    response = driver.execute_cdp_cmd(
+        "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+    )
+    if "exceptionDetails" in response:
+        details = response["exceptionDetails"]
+        message = details.get("exception", {}).get("description") or details.get("text")
+        raise RuntimeError(f"CDP evaluation failed: {message}")
+    return response["result"].get("value")
+
+
+def cdp_call(driver: webdriver.Chrome, fn_source: str, *args: Any) -> Any:
+    """Call a JS function source with JSON-serializable args via cdp_eval"""
+    call_args = ", ".join(json.dumps(a) for a in args)
+    return cdp_eval(driver, f"({fn_source})({call_args})")
+
+
 def safe_click(driver: webdriver.Chrome, element, description: str = "element") -> bool:
     """
     Safely click element with multiple strategies
     """
-    logger.debug(f"Attempting to click: {description}")
+    logger.debug("Attempting to click: %s", description)
     
     try:
         # Try scrolling into view first
@@ -357,20 +989,33 @@ def safe_click(driver: webdriver.Chrome, element, description: str = "element")
         # Try regular click
         try:
             element.click()
-            logger.debug(f"✓ Clicked {description} (regular click)")
+            logger.debug("✓ Clicked %s (regular click)", description)
             return True
         except ElementClickInterceptedException:
-            logger.debug(f"Regular click intercepted, trying JS click for {description}")
+            logger.debug("Regular click intercepted, trying JS click for %s", description)
             driver.execute_script("arguments[0].click();", element)
-            logger.debug(f"✓ Clicked {description} (JS click)")
+            logger.debug("✓ Clicked %s (JS click)", description)
             return True
             
     except Exception as e:
         logger.error(f"✗ Failed to click {description}: {e}")
-        save_screenshot(driver, f"click_failed_{description[:30]}")
+        note_failure(f"click_failed_{description[:30]}")
         return False
 
 
+def fill_fields(driver: webdriver.Chrome, values: Dict[str, str]) -> List[str]:
+    """
+    Set every input id -> value in `values` with one execute_script call
+    Returns the ids that were not found on the page
+    """
+    return driver.execute_script(FILL_FIELDS_JS, values)
+
+
+def path_contains(fragment: str):
+    """Wait condition: current page path contains `fragment`"""
+    return lambda d: d.execute_script(PATH_CONTAINS_JS, fragment)
+
+
 def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> None:
     """
     Login to PMM if not already authenticated
@@ -380,12 +1025,14 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
     logger.info("LOGIN PROCESS STARTING")
     logger.info("="*60)
     
-    wait = WebDriverWait(driver, 600)
+    # Fast poll on a boolean path check: noticed within ~100ms of the redirect
+    wait = WebDriverWait(driver, 600, poll_frequency=FAST_POLL_SECONDS,
+                         ignored_exceptions=(JavascriptException,))
 
     # Try with existing cookies first
     logger.info("Attempting to use existing session cookies...")
     load_cookies(driver)
-    driver.get(PMM_BASE_URL + "/users/dashboard")
+    navigate(driver, PMM_BASE_URL + "/users/dashboard")
     
     if "/users/dashboard" in driver.current_url:
         logger.info("✓ Successfully logged in using existing cookies")
@@ -394,19 +1041,34 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
     logger.info("No valid session found, proceeding with full login...")
     
     # No valid session – do full login
-    driver.get(PMM_BASE_URL + "/")
-    logger.info(f"Navigated to login page: {driver.current_url}")
+    navigate(driver, PMM_BASE_URL + "/")
+    logger.info("Navigated to login page")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Login page URL: %s", driver.current_url)
     
+    # Wait for the whole login form with a single poll that returns every field
+    logger.info("Waiting for login form...")
+    try:
+        login_fields = WebDriverWait(driver, 30).until(
+            lambda d: (lambda r: r if r["username"] and r["password-field"] else False)(
+                d.execute_script(ELEMENTS_BY_ID_JS, LOGIN_FIELD_IDS)
+            )
+        )
+    except TimeoutException:
+        logger.error("✗ Timeout waiting for login form (#username / #password-field)")
+        note_failure("timeout_login_form")
+        raise
+
     # Username
     logger.info("Filling username field...")
-    username_field = wait_for_element(driver, By.CSS_SELECTOR, "#username", timeout=30)
+    username_field = login_fields["username"]
     username_field.clear()
     username_field.send_keys(username)
     logger.info(f"✓ Username entered: {username}")
 
     # Password
     logger.info("Filling password field...")
-    password_field = wait_for_element(driver, By.CSS_SELECTOR, "#password-field", timeout=30)
+    password_field = login_fields["password-field"]
     password_field.clear()
     password_field.send_keys(password)
     logger.info("✓ Password entered")
@@ -414,33 +1076,35 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
     # Email Authenticator
     logger.info("Selecting Email Authenticator...")
     try:
-        email_radio = driver.find_element(By.CSS_SELECTOR, "#authenticator_type_2")
-        if not email_radio.is_selected():
+        email_radio = login_fields["authenticator_type_2"]
+        if email_radio is None:
+            logger.debug("Email authenticator not found")
+        elif not email_radio.is_selected():
             email_radio.click()
             logger.info("✓ Email authenticator selected")
     except Exception as e:
-        logger.debug(f"Email authenticator already selected or not found: {e}")
+        logger.debug("Email authenticator already selected or not found: %s", e)
 
-    # Click login button
+    # Click login button - one lookup for every candidate, filtered locally
     logger.info("Looking for login button...")
     login_clicked = False
-    for locator in [
-        (By.CSS_SELECTOR, "button[type='submit']"),
-        (By.XPATH, "//button[contains(.,'Login') or contains(.,'Sign In')]"),
-        (By.XPATH, "//input[@type='submit']"),
-    ]:
+    buttons = driver.find_elements(By.CSS_SELECTOR, LOGIN_BUTTON_SELECTOR)
+    btn = next(
+        (b for b in buttons
+         if (b.text or b.get_attribute("value") or "").strip().lower() in LOGIN_BUTTON_LABELS),
+        buttons[0] if buttons else None
+    )
+    if btn is not None:
         try:
-            btn = driver.find_element(*locator)
             btn.click()
             login_clicked = True
-            logger.info(f"✓ Login button clicked using locator: {locator}")
-            break
-        except Exception:
-            continue
+            logger.info(f"✓ Login button clicked ({len(buttons)} candidates)")
+        except Exception as e:
+            logger.debug("Login button click failed: %s", e)
 
     if not login_clicked:
         logger.error("✗ Login button not found with any locator")
-        save_screenshot(driver, "login_button_not_found")
+        note_failure("login_button_not_found")
         raise RuntimeError("Login button not found")
 
     # Wait for CAPTCHA and OTP
@@ -448,7 +1112,7 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
     logger.info("⏳ Waiting for OTP page or dashboard...")
     
     try:
-        wait.until(EC.url_contains("/otp-authentication"))
+        wait.until(path_contains("/otp-authentication"))
         logger.info("✓ OTP page reached - waiting for user to enter OTP...")
     except TimeoutException:
         logger.info("No OTP page detected, checking if already at dashboard...")
@@ -456,7 +1120,7 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
     # Wait for dashboard
     logger.info("⏳ Waiting for dashboard...")
     try:
-        wait.until(EC.url_contains("/users/dashboard"))
+        wait.until(path_contains("/users/dashboard"))
         logger.info("✓ Successfully reached dashboard")
         save_cookies(driver)
         logger.info("="*60)
@@ -464,14 +1128,74 @@ def login_if_needed(driver: webdriver.Chrome, username: str, password: str) -> N
         logger.info("="*60)
     except TimeoutException:
         logger.error("✗ Failed to reach dashboard after login")
-        save_screenshot(driver, "login_failed_dashboard")
+        note_failure("login_failed_dashboard")
         raise
 
 
+def get_ticket_id(driver: webdriver.Chrome) -> str:
+    """Read the ticket ID from the hidden ticketID input, falling back to the URL"""
+    ticket_id = cdp_call(driver, TICKET_ID_FN)
+    if ticket_id:
+        logger.debug("Found ticket ID: %s", ticket_id)
+        return str(ticket_id)
+
+    url_match = _TICKET_ID_URL_RE.search(driver.current_url)
+    if url_match:
+        logger.debug("Extracted ticket ID from URL: %s", url_match.group(1))
+        return url_match.group(1)
+
+    # Fallback: placeholder ID (might still work)
+    logger.warning("⚠ Could not get ticket ID, using placeholder '3'")
+    return "3"
+
+
+def read_select_options(driver: webdriver.Chrome, select_element) -> List[List[Any]]:
+    """Return [value, text, selected] for every option of a <select> in one call"""
+    return driver.execute_script(SELECT_OPTIONS_JS, select_element)
+
+
+def set_select(driver: webdriver.Chrome, select_id: str, wanted: str,
+               by_value: bool = False) -> bool:
+    """
+    Set a <select> (plain or Select2-backed) by option text/value in one call
+    Returns False when the select or option is not on the page
+    """
+    return bool(driver.execute_script(SET_SELECT_JS, select_id, wanted, by_value))
+
+
+def safe_set(label: str, fn: Callable[[], Any]) -> bool:
+    """
+    Run a non-critical form step, logging instead of raising
+    A falsy result from `fn` means the field/option was not found
+    """
+    try:
+        if fn():
+            logger.info("✓ %s set", label)
+            return True
+        logger.warning("Could not set %s: field or option not found", label)
+    except Exception as e:
+        logger.warning("Could not set %s: %s", label, e)
+    return False
+
+
+def set_select2(driver: webdriver.Chrome, wait: WebDriverWait,
+                select_id: str, text: str) -> str:
+    """
+    Set a Select2 widget via its underlying <select>, falling back to the
+    Select2 search UI for options that are only loaded on search
+    Returns which path was used ("js" / "select2")
+    """
+    if set_select(driver, select_id, text):
+        return "js"
+    logger.debug("Option '%s' not in #%s, using Select2 search", text, select_id)
+    select2_by_visible_text(driver, wait, f"#select2-{select_id}-container", text)
+    return "select2"
+
+
 def select2_by_visible_text(driver: webdriver.Chrome, wait: WebDriverWait,
                             container_css: str, text: str) -> None:
     """Generic helper for Select2 single selects"""
-    logger.debug(f"Select2 operation: container={container_css}, text={text}")
+    logger.debug("Select2 operation: container=%s, text=%s", container_css, text)
     
     container = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, container_css)))
     container.click()
@@ -485,7 +1209,7 @@ def select2_by_visible_text(driver: webdriver.Chrome, wait: WebDriverWait,
     search_input.send_keys(text)
     search_input.send_keys(Keys.ENTER)
     
-    logger.debug(f"✓ Select2 value set: {text}")
+    logger.debug("✓ Select2 value set: %s", text)
 
 
 def assign_technician_robust(driver: webdriver.Chrome) -> bool:
@@ -504,60 +1228,38 @@ def assign_technician_robust(driver: webdriver.Chrome) -> bool:
         logger.info("Looking for technician dropdown (assign_to)...")
         assign_select = wait_for_element(driver, By.ID, "assign_to", timeout=25)
         
-        # Get all options
-        options = assign_select.find_elements(By.TAG_NAME, "option")
+        # Get all options in one round-trip
+        options = read_select_options(driver, assign_select)
         logger.info(f"Found {len(options)} options in technician dropdown")
         
         # Filter valid technicians
         techs = []
-        for opt in options:
-            val = opt.get_attribute("value")
-            text = opt.text.strip()
+        for val, text, _ in options:
             if val and val not in ("", "0"):
                 techs.append((val, text))
-                logger.debug(f"  - Technician option: '{text}' (value={val})")
+                logger.debug("  - Technician option: '%s' (value=%s)", text, val)
         
         if not techs:
             logger.error("✗ No valid technicians found in dropdown")
-            save_screenshot(driver, "no_technicians")
+            note_failure("no_technicians")
             return False
         
         # Choose random technician
         chosen_val, chosen_name = random.choice(techs)
         logger.info(f"✓ Selected technician: '{chosen_name}' (value={chosen_val})")
         
-        # Set value using Selenium Select
-        logger.debug("Setting technician value using Select...")
-        Select(assign_select).select_by_value(chosen_val)
-        
-        # Trigger change events
-        logger.debug("Triggering JS change events...")
-        driver.execute_script(
-            "arguments[0].dispatchEvent(new Event('input', {bubbles:true}));"
-            "arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
-            assign_select
-        )
-        
-        # Try PMM's internal function if it exists
-        try:
-            driver.execute_script(
-                "if (typeof fun_save_ticket_assign_to === 'function') { "
-                "  console.log('Calling fun_save_ticket_assign_to'); "
-                "  fun_save_ticket_assign_to(); "
-                "}"
-            )
-            logger.debug("✓ PMM internal function called")
-        except Exception as e:
-            logger.debug(f"PMM internal function not available: {e}")
-        
-        time.sleep(1)  # Brief pause for JS to process
+        # Set value, fire change events and call PMM's save hook in one round-trip
+        logger.debug("Setting technician value via JS...")
+        applied_val = driver.execute_script(ASSIGN_TECHNICIAN_JS, assign_select, chosen_val)
+        if applied_val != chosen_val:
+            logger.warning(f"⚠ Technician select reports '{applied_val}', expected '{chosen_val}'")
         
         # Click Save button
         logger.info("Looking for Save button...")
         save_btn = wait_for_element(
             driver, 
-            By.XPATH, 
-            "//button[@type='submit' and @name='btn_save']",
+            By.CSS_SELECTOR,
+            SAVE_BUTTON_SELECTOR,
             timeout=15,
             condition="clickable"
         )
@@ -568,24 +1270,21 @@ def assign_technician_robust(driver: webdriver.Chrome) -> bool:
         
         logger.info("✓ Save button clicked, waiting for page to update...")
         
-        # Wait for save to complete - be flexible about what happens
-        time.sleep(2)
-        
-        # Verify we're still on edit page or reloaded
+        # Wait for save to complete - the form reloads, detaching the old button
         try:
-            wait_for_element(driver, By.ID, "ticketID", timeout=15)
-            logger.info("✓ Technician assignment completed successfully")
-            logger.info("="*60)
-            return True
+            WebDriverWait(driver, 15).until(EC.staleness_of(save_btn))
         except TimeoutException:
-            logger.warning("⚠ Could not verify ticket page after save, but continuing...")
-            logger.info("="*60)
-            return True
+            logger.warning("⚠ Save button still attached after 15s, continuing...")
+        
+        logger.info("✓ Technician assignment completed successfully")
+        logger.info("="*60)
+        return True
             
     except Exception as e:
         logger.error(f"✗ Technician assignment failed: {e}")
-        logger.debug(traceback.format_exc())
-        save_screenshot(driver, "technician_assignment_failed")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        note_failure("technician_assignment_failed")
         logger.info("="*60)
         return False
 
@@ -606,10 +1305,7 @@ def fill_resolution_field(driver: webdriver.Chrome, ticket_type: str) -> bool:
         res_box = wait_for_element(driver, By.ID, "resolution", timeout=20, condition="visible")
         
         # Generate resolution text
-        if ticket_type.upper().strip() == "PROMO":
-            res_text = random.choice(PROMO_RESOLUTION_OPTIONS)
-        else:
-            res_text = random.choice(NORMAL_RESOLUTION_OPTIONS)
+        res_text = build_resolution(ticket_type)
         
         logger.info(f"Resolution text: '{res_text}'")
         
@@ -622,14 +1318,15 @@ def fill_resolution_field(driver: webdriver.Chrome, ticket_type: str) -> bool:
         
     except Exception as e:
         logger.error(f"✗ Failed to fill resolution field: {e}")
-        logger.debug(traceback.format_exc())
-        save_screenshot(driver, "resolution_fill_failed")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        note_failure("resolution_fill_failed")
         logger.info("="*60)
         return False
 
 
 def progress_status_robust(driver: webdriver.Chrome, target_status: str, 
-                          step_num: int, total_steps: int) -> bool:
+                          step_num: int, total_steps: int, ticket_id: str) -> bool:
     """
     Progress to a specific status with robust error handling
     FIXED: Uses correct element ID 'ticketstatusID' and calls JavaScript function fun_save_ticket_status
@@ -638,6 +1335,7 @@ def progress_status_robust(driver: webdriver.Chrome, target_status: str,
         target_status: The status text to select
         step_num: Current step number (for logging)
         total_steps: Total number of status steps
+        ticket_id: PMM ticket ID, read once per ticket by get_ticket_id()
     
     Returns:
         True if successful, False otherwise
@@ -649,18 +1347,7 @@ def progress_status_robust(driver: webdriver.Chrome, target_status: str,
     wait = WebDriverWait(driver, 30)
     max_retries = 3
     
-    # Map status names to match HTML exactly
-    status_mapping = {
-        "With Technician": "With Technician",
-        "In House Repair": "In-house Repair",  # Fixed: Added dash
-        "In-house Repair": "In-house Repair",
-        "Final Check": "Final Check",
-        "Ready": "Ready for Pickup",  # Fixed: Full name
-        "Ready for Pickup": "Ready for Pickup",
-        "Closed": "Closed"
-    }
-    
-    status_to_select = status_mapping.get(target_status, target_status)
+    status_to_select = STATUS_NAME_MAP.get(target_status, target_status)
     
     for attempt in range(1, max_retries + 1):
         try:
@@ -668,11 +1355,11 @@ def progress_status_robust(driver: webdriver.Chrome, target_status: str,
             
             # Verify we're on the ticket edit page
             current_url = driver.current_url
-            logger.debug(f"Current URL: {current_url}")
+            logger.debug("Current URL: %s", current_url)
             
             if "/tickets/edittickets" not in current_url:
                 logger.error(f"✗ Not on edit ticket page. Current URL: {current_url}")
-                save_screenshot(driver, f"wrong_page_status_{target_status}")
+                note_failure(f"wrong_page_status_{target_status}")
                 return False
             
             # FIXED: Wait for CORRECT status dropdown ID
@@ -685,134 +1372,73 @@ def progress_status_robust(driver: webdriver.Chrome, target_status: str,
                 condition="presence"
             )
             
-            # Get current status for logging
-            try:
-                current_status = Select(status_select).first_selected_option.text
+            # Read all options (and the current status) in one round-trip
+            options = read_select_options(driver, status_select)
+            current_status = next((text for _, text, selected in options if selected), None)
+            if current_status is not None:
                 logger.info(f"Current status: '{current_status}'")
-            except Exception:
+            else:
                 logger.debug("Could not determine current status")
             
             # Get the value for the target status
-            logger.debug(f"Finding option with text '{status_to_select}'")
-            select_obj = Select(status_select)
-            
-            # Find option by visible text
-            target_option = None
-            for option in select_obj.options:
-                if option.text.strip() == status_to_select:
-                    target_option = option
-                    break
+            logger.debug("Finding option with text '%s'", status_to_select)
+            text_to_value = {text: value for value, text, _ in options}
+            target_value = text_to_value.get(status_to_select)
             
-            if not target_option:
+            if target_value is None:
                 logger.error(f"✗ Could not find status option: '{status_to_select}'")
                 logger.info("Available options:")
-                for opt in select_obj.options:
-                    logger.info(f"  - '{opt.text.strip()}' (value={opt.get_attribute('value')})")
+                for value, text, _ in options:
+                    logger.info(f"  - '{text}' (value={value})")
                 return False
             
-            target_value = target_option.get_attribute('value')
             logger.info(f"Setting status to: '{status_to_select}' (value={target_value})")
             
-            # Select the status
-            select_obj.select_by_value(target_value)
-            
             # FIXED: Call the JavaScript function that the HTML expects
             # The onchange in HTML: onchange="fun_save_ticket_status(this.value,TICKET_ID)"
-            # We need to get the ticket ID from the page
-            logger.debug(f"Calling fun_save_ticket_status({target_value}, TICKET_ID)")
-            try:
-                # Get ticket ID from the hidden input field or URL
-                ticket_id = None
-                try:
-                    ticket_id_element = driver.find_element(By.ID, "ticketID")
-                    ticket_id = ticket_id_element.get_attribute("value")
-                    logger.debug(f"Found ticket ID: {ticket_id}")
-                except:
-                    # Fallback: extract from URL
-                    import re
-                    url_match = re.search(r'/edittickets/(\d+)', driver.current_url)
-                    if url_match:
-                        ticket_id = url_match.group(1)
-                        logger.debug(f"Extracted ticket ID from URL: {ticket_id}")
-                
-                if ticket_id:
-                    driver.execute_script(f"fun_save_ticket_status({target_value}, {ticket_id});")
-                    logger.debug(f"✓ JavaScript function called: fun_save_ticket_status({target_value}, {ticket_id})")
-                else:
-                    # Fallback: call without ticket ID (might still work)
-                    driver.execute_script(f"fun_save_ticket_status({target_value}, 3);")
-                    logger.warning("⚠ Could not get ticket ID, using placeholder '3'")
-            except Exception as e:
-                logger.warning(f"⚠ Could not call fun_save_ticket_status: {e}")
-                # Continue anyway - might still work
+            # Selecting, firing change and saving happen in a single round-trip
+            logger.debug("Calling fun_save_ticket_status(%s, %s)", target_value, ticket_id)
+            applied_value = cdp_call(driver, SET_STATUS_FN, target_value, ticket_id)
             
-            # Wait for JavaScript to complete (increased for stability)
-            time.sleep(2)
+            if applied_value != target_value:
+                logger.error(f"✗ Attempt {attempt}: Status dropdown reports '{applied_value}', "
+                             f"expected '{target_value}'")
+                if attempt < max_retries:
+                    time.sleep(2)
+                continue
+            logger.debug("✓ JavaScript function called: fun_save_ticket_status(%s, %s)", target_value, ticket_id)
             
             # FIXED: Handle confirmation popup (appears for "Ready" status)
             # The popup asks: "Did you put a warranty sticker inside?" with "Yes, do it!" button
             try:
                 logger.debug("Checking for confirmation popup...")
-                # Try multiple selectors for the "Yes, do it!" button
-                confirm_button = None
-                selectors = [
-                    "button.confirm.btn2.btn-default",  # Most specific
-                    "button.confirm.btn2",              # Less specific
-                    "button.confirm",                    # Even less specific
-                    "button:contains('Yes')",            # Text-based (if supported)
-                ]
-                
-                for selector in selectors:
-                    try:
-                        confirm_button = wait_for_element(
-                            driver,
-                            By.CSS_SELECTOR,
-                            selector,
-                            timeout=2,
-                            condition="clickable"
-                        )
-                        if confirm_button:
-                            logger.info(f"⚠️  Confirmation popup detected (selector: {selector})")
-                            logger.info("Clicking 'Yes, do it!' button...")
-                            safe_click(driver, confirm_button, "Confirmation popup button")
-                            time.sleep(2)  # Wait for popup to close and save to complete
-                            logger.info("✓ Confirmation popup handled")
-                            break
-                    except TimeoutException:
-                        continue
+                confirm_button = driver.execute_async_script(
+                    WAIT_FOR_POPUP_JS, CONFIRM_POPUP_SELECTOR, CONFIRM_POPUP_TIMEOUT_MS
+                )
                 
-                if not confirm_button:
+                if confirm_button:
+                    logger.info("⚠️  Confirmation popup detected")
+                    logger.info("Clicking 'Yes, do it!' button...")
+                    safe_click(driver, confirm_button, "Confirmation popup button")
+                    # Wait for popup to close and save to complete
+                    WebDriverWait(driver, 10).until(
+                        EC.invisibility_of_element_located((By.CSS_SELECTOR, CONFIRM_POPUP_SELECTOR))
+                    )
+                    logger.info("✓ Confirmation popup handled")
+                else:
                     logger.debug("No confirmation popup (normal for most statuses)")
                     
             except Exception as e:
                 logger.warning(f"⚠ Popup handling issue (continuing anyway): {e}")
             
-            # Additional wait after popup handling
-            time.sleep(1)
-            
-            # The JavaScript function should auto-save, so we don't need to click Save
-            # Just wait for the page to be ready
-            try:
-                # Verify the dropdown still exists (page may have reloaded)
-                wait_for_element(driver, By.ID, "ticketstatusID", timeout=10)
-                logger.info(f"✓ Status updated to '{status_to_select}' successfully")
-                logger.info("-"*60)
-                return True
-                
-            except TimeoutException:
-                logger.warning(f"⚠ Attempt {attempt}: Could not verify page state")
-                if attempt < max_retries:
-                    time.sleep(2)
-                    continue
-                else:
-                    # Assume it worked
-                    logger.info(f"✓ Status likely updated to '{status_to_select}' (continuing)")
-                    logger.info("-"*60)
-                    return True
+            # The JavaScript function auto-saves, so we don't need to click Save
+            logger.info(f"✓ Status updated to '{status_to_select}' successfully")
+            logger.info("-"*60)
+            return True
         
         except NoSuchElementException as e:
             logger.error(f"✗ Attempt {attempt}: Element not found: {e}")
-            save_screenshot(driver, f"status_{target_status}_not_found_attempt{attempt}")
+            note_failure(f"status_{target_status}_not_found_attempt{attempt}")
             if attempt < max_retries:
                 time.sleep(2)
                 continue
@@ -825,8 +1451,9 @@ def progress_status_robust(driver: webdriver.Chrome, target_status: str,
         
         except Exception as e:
             logger.error(f"✗ Attempt {attempt}: Unexpected error: {e}")
-            logger.debug(traceback.format_exc())
-            save_screenshot(driver, f"status_{target_status}_error_attempt{attempt}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            note_failure(f"status_{target_status}_error_attempt{attempt}")
             if attempt < max_retries:
                 time.sleep(2)
                 continue
@@ -850,19 +1477,24 @@ def update_status_and_resolution(driver: webdriver.Chrome, ticket_type: str) ->
     try:
         logger.info("Verifying we're on edit ticket page...")
         wait_for_element(driver, By.ID, "ticketID", timeout=30)
-        logger.info(f"✓ On edit ticket page: {driver.current_url}")
+        logger.info("✓ On edit ticket page")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Edit ticket URL: %s", driver.current_url)
     except TimeoutException:
         logger.error("✗ Not on edit ticket page!")
-        save_screenshot(driver, "not_on_edit_page")
+        note_failure("not_on_edit_page")
         raise
     
+    # Read the ticket ID once for the whole status progression
+    ticket_id = get_ticket_id(driver)
+    
     # Step 1: Assign Technician
     tech_success = assign_technician_robust(driver)
     if not tech_success:
         logger.warning("⚠ Technician assignment had issues, but continuing...")
     
-    # Small delay between major steps
-    time.sleep(1)
+    # Let the technician save settle before touching the resolution
+    wait_for_ajax_idle(driver)
     
     # Step 2: Fill Resolution
     res_success = fill_resolution_field(driver, ticket_type)
@@ -870,40 +1502,26 @@ def update_status_and_resolution(driver: webdriver.Chrome, ticket_type: str) ->
         logger.error("✗ Failed to fill resolution - cannot continue")
         raise Exception("Resolution field filling failed")
     
-    # Small delay before status progression
-    time.sleep(1)
+    # Resolution autosave must finish before the first status change
+    wait_for_ajax_idle(driver)
     
     # Step 3: Status Progression
     logger.info("="*60)
     logger.info("STARTING STATUS PROGRESSION")
     logger.info("="*60)
     
-    # FIXED: Status names must match HTML exactly (note the dash in "In-house Repair")
-    status_flow = [
-        "With Technician",
-        "In-house Repair",  # ← FIXED: Added dash to match HTML
-        "Final Check",
-        "Ready for Pickup",  # ← FIXED: Full name from HTML
-        "Closed"
-    ]
-    
-    total_steps = len(status_flow)
+    total_steps = len(STATUS_FLOW)
     
-    for idx, status_text in enumerate(status_flow, start=1):
-        success = progress_status_robust(driver, status_text, idx, total_steps)
+    for idx, status_text in enumerate(STATUS_FLOW, start=1):
+        success = progress_status_robust(driver, status_text, idx, total_steps, ticket_id)
         
         if not success:
             logger.error(f"✗ Failed at status: {status_text}")
             raise Exception(f"Status progression failed at: {status_text}")
         
-        # Increased delay between status changes for JavaScript to complete
+        # Wait for this status's save request to complete before the next one
         if idx < total_steps:
-            # Extra long pause before "Ready for Pickup" status (Chrome stability)
-            if status_flow[idx] == "Ready for Pickup":  # Next status is "Ready for Pickup"
-                logger.info("⏸️  Extra pause before 'Ready for Pickup' status (Chrome stability)...")
-                time.sleep(5)
-            else:
-                time.sleep(2.5)  # Increased from 2 to 2.5 seconds
+            wait_for_ajax_idle(driver)
     
     logger.info("="*60)
     logger.info("✓ STATUS PROGRESSION COMPLETED SUCCESSFULLY")
@@ -927,26 +1545,20 @@ def create_single_ticket(driver: webdriver.Chrome,
     logger.info(f"Store: {store}")
     logger.info("="*80)
     
-    wait_short = WebDriverWait(driver, 30)
-    wait_long = WebDriverWait(driver, 120)
-
-    fields = parsed.fields
-    name = ensure_dot(fields.get("name"))
-    surname = ensure_dot(fields.get("surname"))
-    phone = ensure_dot(fields.get("phone"))
-    invoice = ensure_dot(fields.get("invoice"))
-    material = ensure_dot(fields.get("material"))
-    product = ensure_dot(fields.get("product"))
-    serial = ensure_dot(fields.get("serial"))
-    cstcode = ensure_dot(fields.get("cstcode"))
+    wait_short = WebDriverWait(driver, 30, poll_frequency=FAST_POLL_SECONDS)
+    wait_long = WebDriverWait(driver, 120, poll_frequency=FAST_POLL_SECONDS,
+                              ignored_exceptions=(JavascriptException,))
+
+    # parse_pdf already normalized every field to "." when missing
+    name, surname, phone, invoice, cstcode, material, product, serial = parsed.fields
     
     if serial == ".":
         serial = invoice
         logger.debug("Serial was missing, using invoice number as serial")
 
     # Normalize phone
-    clean_phone = phone.replace(" ", "").replace("-", "").lstrip("0")
-    if not clean_phone.isdigit():
+    clean_phone = phone.translate(_PHONE_STRIP).lstrip("0")
+    if not _PHONE_DIGITS_RE.fullmatch(clean_phone):
         clean_phone = "00000000"
         logger.warning(f"Invalid phone number, using placeholder: {clean_phone}")
     phone_val = "+357" + clean_phone
@@ -962,39 +1574,27 @@ def create_single_ticket(driver: webdriver.Chrome,
 
     # Navigate to Add Ticket page
     logger.info("Navigating to Add Ticket page...")
-    driver.get(PMM_BASE_URL + "/tickets/addtickets")
+    navigate(driver, PMM_BASE_URL + "/tickets/addtickets")
     wait_long.until(EC.presence_of_element_located((By.CSS_SELECTOR, "form")))
     logger.info("✓ Add Ticket page loaded")
 
     # ========== STORE ==========
     logger.info(f"Setting store: {store}")
     try:
-        select2_by_visible_text(driver, wait_short, "#select2-store_id-container", store)
-        logger.info("✓ Store set (Select2)")
+        via = set_select2(driver, wait_short, "store_id", store)
+        logger.info(f"✓ Store set ({via})")
     except Exception as e:
-        logger.debug(f"Select2 failed, trying regular select: {e}")
-        try:
-            Select(driver.find_element(By.ID, "store_id")).select_by_visible_text(store)
-            logger.info("✓ Store set (regular select)")
-        except Exception as e2:
-            logger.error(f"✗ Failed to set store: {e2}")
+        logger.error(f"✗ Failed to set store: {e}")
 
     # ========== TICKET CATEGORY ==========
     logger.info("Setting ticket category to 'In Warranty'")
-    try:
-        cat = driver.find_element(By.ID, "pmm_ticket_category")
-        Select(cat).select_by_visible_text("In Warranty")
-        logger.info("✓ Category set")
-    except Exception as e:
-        logger.warning(f"Could not set category: {e}")
+    safe_set("Category", lambda: set_select(driver, "pmm_ticket_category", "In Warranty"))
 
     # ========== ADD CUSTOMER ==========
     logger.info("Opening Add Customer modal...")
     try:
-        wait_short.until(EC.invisibility_of_element_located(
-            (By.CSS_SELECTOR, "div.blockUI.blockOverlay")
-        ))
-    except:
+        wait_blockui_gone(driver, timeout=30)
+    except Exception:
         pass
 
     try:
@@ -1004,7 +1604,7 @@ def create_single_ticket(driver: webdriver.Chrome,
         logger.info("✓ Add Customer button clicked")
     except Exception as e:
         logger.error(f"✗ Could not open customer modal: {e}")
-        save_screenshot(driver, "customer_modal_failed")
+        note_failure("customer_modal_failed")
         raise
 
     # Wait for modal
@@ -1014,7 +1614,7 @@ def create_single_ticket(driver: webdriver.Chrome,
         logger.info("✓ Customer modal appeared")
     except:
         logger.error("✗ Customer modal did not appear")
-        save_screenshot(driver, "customer_modal_not_visible")
+        note_failure("customer_modal_not_visible")
         raise
 
     # Fill Customer Modal
@@ -1022,52 +1622,34 @@ def create_single_ticket(driver: webdriver.Chrome,
     try:
         # Store inside modal
         try:
-            cs = wait_short.until(EC.presence_of_element_located((By.ID, "customer_storeID")))
-            Select(cs).select_by_visible_text(store)
-            logger.debug("✓ Customer store set")
+            wait_short.until(EC.presence_of_element_located((By.ID, "customer_storeID")))
+            if set_select(driver, "customer_storeID", store):
+                logger.debug("✓ Customer store set")
+            else:
+                logger.debug("Customer store option not found: %s", store)
         except Exception as e:
-            logger.debug(f"Customer store field issue: {e}")
+            logger.debug("Customer store field issue: %s", e)
 
         # Type = Person
-        try:
-            ctype = wait_short.until(EC.presence_of_element_located((By.ID, "type")))
-            Select(ctype).select_by_value("1")
+        if set_select(driver, "type", "1", by_value=True):
             logger.debug("✓ Customer type set to Person")
-        except Exception as e:
-            logger.debug(f"Customer type field issue: {e}")
-
-        # First Name
-        fn = wait_for_element(driver, By.ID, "firstName", timeout=30, condition="visible")
-        fn.clear()
-        fn.send_keys(name)
-        logger.debug(f"✓ First name: {name}")
-
-        # Last Name
-        ln = driver.find_element(By.ID, "lastName")
-        ln.clear()
-        ln.send_keys(surname)
-        logger.debug(f"✓ Last name: {surname}")
-
-        # Optional email clear
-        try:
-            driver.find_element(By.ID, "email").clear()
-        except:
-            pass
-
-        # Phone
-        try:
-            ph = driver.find_element(By.ID, "phoneNo")
-            ph.clear()
-            ph.send_keys(phone_val)
-            logger.debug(f"✓ Phone: {phone_val}")
-        except Exception as e:
-            logger.debug(f"Phone field issue: {e}")
-
-        # Mobile (required)
-        mob = wait_for_element(driver, By.ID, "mobile", timeout=30, condition="visible")
-        mob.clear()
-        mob.send_keys(phone_val)
-        logger.debug(f"✓ Mobile: {phone_val}")
+        else:
+            logger.debug("Customer type field not found")
+
+        # Text fields in one round-trip (mobile is required)
+        wait_for_element(driver, By.ID, "firstName", timeout=30, condition="visible")
+        missing = fill_fields(driver, {
+            "firstName": name,
+            "lastName": surname,
+            "email": "",
+            "phoneNo": phone_val,
+            "mobile": phone_val,
+        })
+        if {"firstName", "lastName", "mobile"}.intersection(missing):
+            raise NoSuchElementException(f"Customer fields missing: {missing}")
+        if missing:
+            logger.debug("Optional customer fields not found: %s", missing)
+        logger.debug("✓ Customer: %s %s, phone/mobile: %s", name, surname, phone_val)
 
         # Save customer
         logger.info("Saving customer...")
@@ -1088,141 +1670,55 @@ def create_single_ticket(driver: webdriver.Chrome,
 
     except Exception as e:
         logger.error(f"✗ Failed filling customer modal: {e}")
-        logger.debug(traceback.format_exc())
-        save_screenshot(driver, "customer_fill_failed")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        note_failure("customer_fill_failed")
         raise
 
-    # ========== DEVICE ==========
-    logger.info("Setting device to 'Other/Generic'")
-    try:
-        select2_by_visible_text(driver, wait_short, "#select2-device_id-container", "Other/Generic")
-        logger.info("✓ Device set")
-    except Exception as e:
-        logger.warning(f"Could not set device: {e}")
-
-    # ========== MATERIAL DESCRIPTION ==========
-    logger.info(f"Setting material description: {product}")
-    try:
-        el = driver.find_element(By.ID, "pmm_material_description")
-        el.clear()
-        el.send_keys(product)
-        logger.info("✓ Material description set")
-    except Exception as e:
-        logger.warning(f"Could not set material description: {e}")
+    # ========== DEVICE / PASSWORD TYPE / BOOTABLE ==========
+    logger.info("Setting device 'Other/Generic', password type 'No code', bootable 'Yes'")
+    safe_set("Device", lambda: set_select2(driver, wait_short, "device_id", "Other/Generic"))
+    safe_set("Password type", lambda: set_select(driver, "device_password_type", "No code"))
+    safe_set("Bootable", lambda: set_select(driver, "device_bootable", "Yes"))
 
-    # ========== PASSWORD TYPE ==========
-    logger.info("Setting password type to 'No code'")
-    try:
-        Select(driver.find_element(By.ID, "device_password_type")).select_by_visible_text("No code")
-        logger.info("✓ Password type set")
-    except Exception as e:
-        logger.warning(f"Could not set password type: {e}")
-
-    # ========== SERIAL ==========
-    logger.info(f"Setting serial: {serial}")
-    try:
-        sn = driver.find_element(By.ID, "serial_no")
-        sn.clear()
-        sn.send_keys(serial)
-        logger.info("✓ Serial set")
-    except Exception as e:
-        logger.warning(f"Could not set serial: {e}")
-
-    # ========== VISIBLE DAMAGE ==========
-    damage_choice = random.choice(VISIBLE_DAMAGE_OPTIONS)
-    logger.info(f"Setting visible damage: {damage_choice}")
-    try:
-        dmg = driver.find_element(By.ID, "repair_print")
-        dmg.clear()
-        dmg.send_keys(damage_choice)
-        logger.info("✓ Visible damage set")
-    except Exception as e:
-        logger.warning(f"Could not set visible damage: {e}")
-
-    # ========== BOOTABLE ==========
-    logger.info("Setting bootable to 'Yes'")
-    try:
-        Select(driver.find_element(By.ID, "device_bootable")).select_by_visible_text("Yes")
-        logger.info("✓ Bootable set")
-    except Exception as e:
-        logger.warning(f"Could not set bootable: {e}")
-
-    # ========== MATERIAL ==========
-    logger.info(f"Setting material: {material}")
-    try:
-        mat = driver.find_element(By.ID, "pmm_material")
-        driver.execute_script("arguments[0].removeAttribute('readonly');", mat)
-        mat.clear()
-        mat.send_keys(material)
-        logger.info("✓ Material set")
-    except Exception as e:
-        logger.warning(f"Could not set material: {e}")
-
-    # ========== CONTRACT NUMBER ==========
-    logger.info(f"Setting contract number: {invoice}")
-    try:
-        cn = driver.find_element(By.ID, "pmm_safety_net_contract_number")
-        cn.clear()
-        cn.send_keys(invoice)
-        logger.info("✓ Contract number set")
-    except Exception as e:
-        logger.warning(f"Could not set contract number: {e}")
-
-    # ========== ITEMS LEFT ==========
-    items_left_text = random.choice(["only device", "full box device"])
-    logger.info(f"Setting items left: {items_left_text}")
-    try:
-        il = driver.find_element(By.ID, "pmm_items_left_with_device")
-        il.clear()
-        il.send_keys(items_left_text)
-        logger.info("✓ Items left set")
-    except Exception as e:
-        logger.warning(f"Could not set items left: {e}")
-
-    # ========== NAVISION CUSTOMER NUMBER ==========
+    # ========== TEXT FIELDS ==========
+    # Material, serial, damage, contract, items left, Navision and repair in one call
+    damage_choice = next_option(_DAMAGE_CYCLE)
+    items_left_text = next_option(_ITEMS_LEFT_CYCLE)
     nav_value = cstcode if cstcode != "." else invoice
-    logger.info(f"Setting Navision Customer Number: {nav_value}")
-    try:
-        nav_field = wait_for_element(
-            driver,
-            By.ID,
-            "pmm_navision_customer_number",
-            timeout=30,
-            condition="visible"
-        )
-        nav_field.clear()
-        nav_field.send_keys(nav_value)
-
-        # Trigger events
-        driver.execute_script(
-            "arguments[0].dispatchEvent(new Event('input', {bubbles:true}));"
-            "arguments[0].dispatchEvent(new Event('change', {bubbles:true}));",
-            nav_field
-        )
-        logger.info("✓ Navision Customer Number set")
-    except Exception as e:
-        logger.error(f"✗ Could not set Navision Customer Number: {e}")
-        save_screenshot(driver, "navision_field_failed")
-
-    # ========== REPAIR DESCRIPTION ==========
-    logger.info("Building repair description...")
+    final_desc = build_repair_description(ticket_type, items_left_text)
+    ticket_fields = {
+        "pmm_material_description": product,
+        "serial_no": serial,
+        "repair_print": damage_choice,
+        "pmm_material": material,
+        "pmm_safety_net_contract_number": invoice,
+        "pmm_items_left_with_device": items_left_text,
+        "pmm_navision_customer_number": nav_value,
+        "repair": final_desc,
+    }
+    logger.info("Filling ticket fields:")
+    for field_id, value in ticket_fields.items():
+        logger.info(f"  {field_id}: {value}")
     try:
-        repair_box = wait_for_element(driver, By.ID, "repair", timeout=30, condition="visible")
-        final_desc = build_repair_description(ticket_type, items_left_text)
-        repair_box.clear()
-        repair_box.send_keys(final_desc)
-        logger.info(f"✓ Repair description set: {final_desc}")
+        # Navision and repair are required - wait for them before the fill
+        wait_for_element(driver, By.ID, "pmm_navision_customer_number", timeout=30, condition="visible")
+        wait_for_element(driver, By.ID, "repair", timeout=30, condition="visible")
+        missing = fill_fields(driver, ticket_fields)
+        if missing:
+            logger.warning(f"Could not set fields (not found): {missing}")
+        logger.info(f"✓ {len(ticket_fields) - len(missing)}/{len(ticket_fields)} ticket fields set")
     except Exception as e:
-        logger.error(f"✗ Could not fill repair description: {e}")
-        save_screenshot(driver, "repair_description_failed")
+        logger.error(f"✗ Could not fill ticket fields: {e}")
+        note_failure("ticket_fields_failed")
 
     # ========== SAVE TICKET ==========
     logger.info("Saving ticket...")
     try:
         save_btn = wait_for_element(
             driver,
-            By.XPATH,
-            "//button[@type='submit' and @name='btn_save']",
+            By.CSS_SELECTOR,
+            SAVE_BUTTON_SELECTOR,
             timeout=30,
             condition="clickable"
         )
@@ -1233,17 +1729,19 @@ def create_single_ticket(driver: webdriver.Chrome,
         logger.info("✓ Save button clicked")
     except Exception as e:
         logger.error(f"✗ Could not click Save Ticket: {e}")
-        save_screenshot(driver, "save_ticket_failed")
+        note_failure("save_ticket_failed")
         raise
 
     # ========== WAIT FOR EDIT PAGE ==========
     logger.info("Waiting for Edit Ticket page...")
     try:
-        wait_long.until(EC.url_contains("/tickets/edittickets"))
-        logger.info(f"✓ Edit Ticket page loaded: {driver.current_url}")
+        wait_long.until(path_contains("/tickets/edittickets"))
+        logger.info("✓ Edit Ticket page loaded")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Edit ticket URL: %s", driver.current_url)
     except:
         logger.error("✗ Did not reach Edit Ticket page")
-        save_screenshot(driver, "edit_page_not_reached")
+        note_failure("edit_page_not_reached")
         raise
 
     # ========== UPDATE STATUS AND RESOLUTION ==========
@@ -1252,84 +1750,130 @@ def create_single_ticket(driver: webdriver.Chrome,
         logger.info("✓✓✓ TICKET COMPLETED SUCCESSFULLY ✓✓✓")
     except Exception as e:
         logger.error(f"✗ Failed during status/resolution workflow: {e}")
-        logger.debug(traceback.format_exc())
-        save_screenshot(driver, "status_workflow_failed")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        note_failure("status_workflow_failed")
         raise
 
     logger.info("="*80)
     logger.info("")
 
 
+def process_ticket(driver: webdriver.Chrome,
+                   idx: int,
+                   total: int,
+                   parsed: ParsedInvoice,
+                   ticket_type: str,
+                   store: str) -> Dict[str, Any]:
+    """
+    Create one ticket and build its result entry
+    Safe to call from several threads, each with its own driver
+    """
+    logger.info("")
+    logger.info("*"*80)
+    logger.info(f"PROCESSING TICKET {idx}/{total}")
+    logger.info("*"*80)
+
+    take_failure_tags()
+    try:
+        create_single_ticket(driver, parsed, ticket_type, store)
+        take_failure_tags()  # recovered mishaps don't need a screenshot
+        logger.info(f"✓✓✓ TICKET {idx}/{total} SUCCESS ✓✓✓")
+        return {
+            "id": parsed.id,
+            "filename": parsed.filename,
+            "success": True,
+            "error": ""
+        }
+        
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"✗✗✗ TICKET {idx}/{total} FAILED ✗✗✗")
+        logger.error(f"Error: {error_msg}")
+        screenshot_failure(driver, "ticket_failed")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
+        
+        return {
+            "id": parsed.id,
+            "filename": parsed.filename,
+            "success": False,
+            "error": error_msg
+        }
+
+
 def run_ticket_batch(crm_username: str,
                      crm_password: str,
                      tickets_payload: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Run a batch of tickets with comprehensive logging
+    Fans tickets out over TICKETER_WORKERS threads (one pooled driver each),
+    or runs them serially on one driver when there is a single worker/job
     """
     logger.info("")
     logger.info("="*80)
     logger.info(f"STARTING BATCH OF {len(tickets_payload)} TICKETS")
     logger.info("="*80)
     
-    results: List[Dict[str, Any]] = []
-    driver = None
-    
-    try:
-        driver = get_driver()
-        login_if_needed(driver, crm_username, crm_password)
-
-        for idx, t in enumerate(tickets_payload, start=1):
-            fid = t["id"]
-            ticket_type = t["ticket_type"]
-            store = t["store"]
-            
-            logger.info("")
-            logger.info("*"*80)
-            logger.info(f"PROCESSING TICKET {idx}/{len(tickets_payload)}")
-            logger.info("*"*80)
-            
-            parsed = parsed_files.get(str(fid))
-            if not parsed:
-                logger.error(f"✗ Parsed invoice not found for ID: {fid}")
-                results.append({
-                    "id": fid,
-                    "filename": "(unknown)",
-                    "success": False,
-                    "error": "Parsed invoice not found in server memory."
-                })
-                continue
-
+    total = len(tickets_payload)
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    jobs: List[tuple] = []
+    positions: List[int] = []
+
+    for pos, t in enumerate(tickets_payload):
+        fid = t["id"]
+        parsed = get_parsed(str(fid))
+        if not parsed:
+            logger.error(f"✗ Parsed invoice not found for ID: {fid}")
+            results[pos] = {
+                "id": fid,
+                "filename": "(unknown)",
+                "success": False,
+                "error": "Parsed invoice not found in server memory."
+            }
+            continue
+        jobs.append((pos + 1, total, parsed, t["ticket_type"], t["store"]))
+        positions.append(pos)
+
+    workers = min(TICKETER_WORKERS, POOL.size, len(jobs))
+    if workers > 1:
+        # ChromeDriver sessions are independent HTTP clients: each thread owns the
+        # driver it acquired, so no locking is needed around Selenium calls
+        logger.info(f"Dispatching {len(jobs)} tickets to {workers} worker threads")
+
+        def run_job(job: tuple) -> Dict[str, Any]:
+            # Logins happen lazily per thread, possibly after other threads have
+            # already created tickets: a failure fails this job, not the batch
+            idx, total, parsed = job[:3]
             try:
-                create_single_ticket(driver, parsed, ticket_type, store)
-                results.append({
-                    "id": fid,
-                    "filename": parsed.filename,
-                    "success": True,
-                    "error": ""
-                })
-                logger.info(f"✓✓✓ TICKET {idx}/{len(tickets_payload)} SUCCESS ✓✓✓")
-                
+                driver = acquire_driver(crm_username, crm_password)
             except Exception as e:
-                error_msg = str(e)
-                logger.error(f"✗✗✗ TICKET {idx}/{len(tickets_payload)} FAILED ✗✗✗")
-                logger.error(f"Error: {error_msg}")
-                logger.debug(traceback.format_exc())
-                
-                results.append({
-                    "id": fid,
+                logger.error(f"✗✗✗ TICKET {idx}/{total} FAILED ✗✗✗")
+                logger.error(f"Error: could not get a logged-in browser: {e}")
+                return {
+                    "id": parsed.id,
                     "filename": parsed.filename,
                     "success": False,
-                    "error": error_msg
-                })
-                
-    finally:
-        if driver is not None:
-            logger.info("Closing browser...")
+                    "error": f"Login failed: {e}"
+                }
             try:
-                driver.quit()
-                logger.info("✓ Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {e}")
+                return process_ticket(driver, *job)
+            finally:
+                release_driver(driver)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ticket") as executor:
+            job_results = list(executor.map(run_job, jobs))
+    else:
+        job_results = []
+        driver = acquire_driver(crm_username, crm_password)
+        try:
+            for job in jobs:
+                job_results.append(process_ticket(driver, *job))
+        finally:
+            release_driver(driver)
+
+    for pos, result in zip(positions, job_results):
+        results[pos] = result
 
     logger.info("")
     logger.info("="*80)
@@ -1345,12 +1889,22 @@ def run_ticket_batch(crm_username: str,
 
 app = Flask(__name__)
 
+# Browser cache lifetime for the UI and static files (ETag/Last-Modified give 304s after)
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 3600))
+
+
+def send_static(filename: str):
+    """Serve a file from the app directory with conditional and cache headers"""
+    # send_file hands the open file to wsgi.file_wrapper, so servers that support
+    # it (gunicorn) stream it with sendfile(2)
+    return send_from_directory('.', filename, conditional=True, etag=True,
+                               max_age=STATIC_MAX_AGE)
+
 
 @app.route("/parse_pdfs", methods=["POST"])
 def api_parse_pdfs():
     """Parse uploaded PDFs"""
-    global parsed_files
-    parsed_files = {}
+    clear_parsed()
 
     logger.info("="*60)
     logger.info("API: /parse_pdfs called")
@@ -1359,43 +1913,29 @@ def api_parse_pdfs():
     files = request.files.getlist("pdfs")
     logger.info(f"Received {len(files)} files")
     
-    out: List[Dict[str, Any]] = []
-
+    file_ids: List[str] = []
+    uploads: List[Tuple[str, bytes]] = []
     for idx, f in enumerate(files):
         if not f.filename.lower().endswith(".pdf"):
             logger.warning(f"Skipping non-PDF file: {f.filename}")
             continue
-            
-        safe_name = f.filename
-        path = os.path.join(PDF_UPLOAD_DIR, safe_name)
-        f.save(path)
-        logger.info(f"Saved: {path}")
+        file_ids.append(str(idx + 1))
+        # Raw bytes (not the upload stream) so they can cross the process boundary
+        uploads.append((f.filename, f.read()))
 
-        fields = parse_pdf(path)
-        
-        normalized = {
-            "name": ensure_dot(fields.get("name")),
-            "surname": ensure_dot(fields.get("surname")),
-            "phone": ensure_dot(fields.get("phone")),
-            "invoice": ensure_dot(fields.get("invoice")),
-            "cstcode": ensure_dot(fields.get("cstcode")),
-            "material": ensure_dot(fields.get("material")),
-            "product": ensure_dot(fields.get("product")),
-            "serial": ensure_dot(fields.get("serial")),
-        }
+    out: List[Dict[str, Any]] = []
 
-        file_id = str(idx + 1)
+    for file_id, (safe_name, _), fields in zip(file_ids, uploads, parse_pdf_batch(uploads)):
         parsed = ParsedInvoice(
             id=file_id,
             filename=safe_name,
-            path=path,
-            fields=normalized,
+            fields=fields,
         )
-        parsed_files[file_id] = parsed
+        remember_parsed(parsed)
         out.append({
             "id": file_id,
             "filename": safe_name,
-            "fields": normalized,
+            "fields": fields._asdict(),
         })
 
     logger.info(f"Successfully parsed {len(out)} PDFs")
@@ -1426,7 +1966,8 @@ def api_create_tickets():
         return jsonify({"results": results})
     except Exception as e:
         logger.error(f"API error: {e}")
-        logger.debug(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
         return jsonify({"error": str(e)}), 500
 
 
@@ -1440,24 +1981,32 @@ def health():
     })
 
 
+# Local version first (for local development), then the cloud version
+UI_FILES = ("TICKETHELPER.html", "TICKETHELPER_CLOUD.html")
+_ui_file: Optional[str] = None
+
+
+def find_ui_file() -> Optional[str]:
+    """Resolve the UI file once; keeps probing only while none exists yet"""
+    global _ui_file
+    if _ui_file is None:
+        _ui_file = next((name for name in UI_FILES if os.path.exists(name)), None)
+    return _ui_file
+
+
 @app.route("/")
 def index():
     """Serve the UI - tries TICKETHELPER.html first, then TICKETHELPER_CLOUD.html"""
-    import os
-    # Try local version first (for local development)
-    if os.path.exists("TICKETHELPER.html"):
-        return send_from_directory('.', "TICKETHELPER.html")
-    # Fallback to cloud version
-    elif os.path.exists("TICKETHELPER_CLOUD.html"):
-        return send_from_directory('.', "TICKETHELPER_CLOUD.html")
-    else:
+    ui_file = find_ui_file()
+    if ui_file is None:
         return jsonify({"error": "No HTML interface found. Please upload TICKETHELPER.html or TICKETHELPER_CLOUD.html"}), 404
+    return send_static(ui_file)
 
 
 @app.route("/<path:path>")
 def static_files(path):
     """Serve static files"""
-    return send_from_directory('.', path)
+    return send_static(path)
 
 
 if __name__ == "__main__":
@@ -1479,4 +2028,5 @@ if __name__ == "__main__":
     print(f"🌐 BINDING TO: {host}:{port} (debug={debug})")
     logger.info(f"🌐 Starting server on {host}:{port} (debug={debug})")
     
-    app.run(host=host, port=port, debug=debug)
+    # Development server only - production runs gunicorn (see gunicorn.conf.py)
+    app.run(host=host, port=port, debug=debug, threaded=True)
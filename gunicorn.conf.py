@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+Gunicorn settings for TICKETER in production (picked up automatically from the app dir)
+
+A single worker process keeps the in-memory state - parsed invoices, the Chrome
+pool and its logged-in sessions - coherent across requests; gthread threads let
+/parse_pdfs and /create_tickets calls run concurrently inside it.
+"""
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_WORKERS", 1))
+threads = int(os.environ.get("WEB_THREADS", 8))
+accesslog = "-"
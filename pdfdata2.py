@@ -2,16 +2,40 @@
 # Outputs: name, surname, phone, invoice, "cst code", material, product, serial
 
 import sys, re, json
+from bisect import bisect_left, bisect_right
+from collections import Counter
 from pdfminer.high_level import extract_pages
 from pdfminer.layout import LTTextContainer, LTTextLine
 
+# PyMuPDF (C) reads born-digital text layers far faster than pdfminer
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# google-re2 (linear-time DFA) when installed, for the literal keyword
+# alternations and the bytes price scan only: re2's \s and \d are ASCII-only,
+# while `re` on str also matches NBSP, thin spaces and non-ASCII digits, so
+# patterns using those classes on text stay on `re`
+try:
+    import re2 as scan_re
+except ImportError:
+    scan_re = re
+
 # ---------- helpers ----------
 NAME_TOKEN = r"[A-Za-zΑ-Ωα-ωΪΫϊϋΐΰάέήίόύώΆΈΉΊΌΎΏ\.-]+"
 NAME_LINE_RE = re.compile(rf"^{NAME_TOKEN}(?:\s+{NAME_TOKEN})+$")
 SKU_RE   = re.compile(r"^\d{6,8}$")
 MONEY_RE = re.compile(r"-?\d{1,3}(?:[.,]\d{3})*(?:[.,]\d{2})")
+# Same pattern over UTF-8 bytes (ASCII-only \d), for the whole-document price scan
+MONEY_BYTES_RE = scan_re.compile(rb"-?\d{1,3}(?:[.,]\d{3})*(?:[.,]\d{2})")
 SERIAL_RE = re.compile(r"(\d{14,20})")
-PHONE8_RE = re.compile(r"(?<!\d)([29]\d{7})(?!\d)")
+PHONE8_RE = re.compile(r"(?<!\d)([29]\d{7})(?!\d)")  # lookarounds: not supported by re2
+INTL_PHONE_RE = re.compile(r"\+(\d{10,15})")
+MONEY_VALUE_RE = re.compile(r"-?\d+(?:\.\d{2})")
+MONEY_GREEK_RE = re.compile(r"-?\d{1,3}(?:\.\d{3})*,\d{2}")  # 1.234,56 - the usual invoice form
+NAME_CHARS_RE = re.compile(r"^[A-Za-zΑ-Ωα-ωΪΫϊϋΐΰάέήίόύώΆΈΉΊΌΎΏ\.\-\s]+$")
+LETTER_RE = re.compile(r"[A-Za-zΑ-Ωα-ω]")
 
 # Updated invoice regex to handle both formats
 INVOICE_OLD_RE = re.compile(r"Αρ\. παραστατικού:\s*([0-9]+ΑΠΔΑ[0-9]+)")
@@ -32,6 +56,18 @@ NAME_BLACKLIST = {
     "Κωδικός Είδους", "Περιγραφή", "Ποσότητα",
     "Τιμή Μονάδος", "Έκπτωση", "Αξία"
 }
+# All terms as one automaton: a single pass answers "contains any of them?"
+NAME_BLACKLIST_RE = scan_re.compile("|".join(map(re.escape, sorted(NAME_BLACKLIST))))
+
+# Product keywords (matched against uppercased text) for descriptions on a
+# SKU line and for standalone description lines in the items table
+SKU_DESC_KEYWORDS = ("APPLE", "IPHONE", "CHARGER", "CABLE", "CASE", "USB", "SAMSUNG", "MAC", "JBL", "SPEAKER")
+PRODUCT_KEYWORDS = SKU_DESC_KEYWORDS + ("EARPODS", "HANDSFREE", "PORTABLE")
+# Each list as one alternation: one pass per line instead of one `in` per keyword
+SKU_DESC_KEYWORDS_RE = scan_re.compile("|".join(SKU_DESC_KEYWORDS))
+PRODUCT_KEYWORDS_RE = scan_re.compile("|".join(PRODUCT_KEYWORDS))
+TABLE_END_MARKERS = ("ΣΚΟΠΟΣ ΔΙΑΚΙΝΗΣΗΣ", "ΤΟΠΟΣ ΑΠΟΣΤΟΛΗΣ", "ΣΧΟΛΙΑ", "Συνολική", "ΤΗΛΕΦΩΝΟ:", "ΠΟΛΗ:")
+TABLE_LABELS = frozenset({"Ώρα", "Μ.Μ.", "Περιγραφή", "Ποσότητα", "Τιμή Μονάδος", "Σειρά", "TMX"})
 
 
 def is_bad_cst(s: str) -> bool:
@@ -48,26 +84,73 @@ def is_bad_cst(s: str) -> bool:
     return False
 
 
-def get_lines(pdf_path):
-    lines = []
-    for page in extract_pages(pdf_path):
+# A first page with less text than this is a scan: the rest is not parsed
+SCANNED_MIN_CHARS = 20
+
+
+def fitz_page_lines(pdf_path):
+    """
+    Stripped text lines of every page via PyMuPDF ([] for image-only pages)
+    Returns None when PyMuPDF is unavailable or can't open the file
+    """
+    if fitz is None:
+        return None
+    try:
+        # Opening by path lets MuPDF seek the file lazily instead of
+        # loading it into memory; streams are read once and rewound for pdfminer
+        if isinstance(pdf_path, str):
+            doc = fitz.open(pdf_path)
+        else:
+            data = pdf_path.read()
+            pdf_path.seek(0)  # before opening: a file MuPDF rejects still goes to pdfminer
+            doc = fitz.open(stream=data, filetype="pdf")
+        with doc:
+            return [[s for s in map(str.strip, page.get_text("text").splitlines()) if s] for page in doc]
+    except Exception:
+        return None
+
+
+def iter_page_lines(pdf_path, fast=True):
+    """
+    Yield the stripped text lines of each page
+    Uses PyMuPDF when `fast` and it can read the text layer; otherwise pdfminer,
+    laying pages out lazily and yielding nothing for a scan (image-only first page)
+    """
+    pages = fitz_page_lines(pdf_path) if fast else None
+    if pages and any(pages):
+        yield from pages
+        return
+    for page_no, page in enumerate(extract_pages(pdf_path)):
+        lines = []
+        add = lines.append
         for el in page:
             if isinstance(el, LTTextContainer):
                 for tl in el:
                     if isinstance(tl, LTTextLine):
                         s = tl.get_text().strip()
                         if s:
-                            lines.append(s)
+                            add(s)
+        if page_no == 0 and sum(map(len, lines)) < SCANNED_MIN_CHARS:
+            return
+        yield lines
+
+
+def get_lines(pdf_path, fast=True):
+    lines = []
+    for page_lines in iter_page_lines(pdf_path, fast):
+        lines.extend(page_lines)
     return lines
 
 
 def parse_money(s: str):
     s = s.strip().replace(" ", "")
+    if MONEY_GREEK_RE.fullmatch(s):
+        return float(s.replace(".", "").replace(",", "."))
     if "," in s and "." in s:
         if s.find(".") < s.find(","): s = s.replace(".", "")
         else: s = s.replace(",", "")
     s = s.replace(",", ".")
-    m = re.search(r"-?\d+(?:\.\d{2})", s)
+    m = MONEY_VALUE_RE.search(s)
     return float(m.group(0)) if m else None
 
 
@@ -77,10 +160,8 @@ def looks_like_name(s: str) -> bool:
         return False
     if any(ch.isdigit() for ch in s): 
         return False
-    # Check blacklist
-    if s in NAME_BLACKLIST:
-        return False
-    if any(blacklisted in s for blacklisted in NAME_BLACKLIST):
+    # Check blacklist (exact or contained)
+    if NAME_BLACKLIST_RE.search(s):
         return False
     # Should match name pattern and be reasonable length
     if not NAME_LINE_RE.match(s):
@@ -108,6 +189,9 @@ def parse_items(lines, phone_to_exclude=""):
     if table_start is None:
         return items
     
+    # Uppercase every line once for the keyword checks below
+    upper_lines = [line.upper() for line in lines]
+    
     # Collect all SKUs and check if they're on the same line as descriptions
     skus = []
     sku_positions = {}
@@ -129,7 +213,8 @@ def parse_items(lines, phone_to_exclude=""):
                 skus.append(sku)
                 sku_positions[sku] = i
                 # Store the description that was on the same line
-                if any(keyword in desc.upper() for keyword in ["APPLE", "IPHONE", "CHARGER", "CABLE", "CASE", "USB", "SAMSUNG", "MAC", "JBL", "SPEAKER"]):
+                # (the SKU part is digits, so the whole uppercased line will do)
+                if SKU_DESC_KEYWORDS_RE.search(upper_lines[i]):
                     sku_with_desc[sku] = desc
     
     if not skus:
@@ -145,24 +230,26 @@ def parse_items(lines, phone_to_exclude=""):
         if sku in sku_with_desc:
             product_descriptions[sku] = sku_with_desc[sku]
     
+    sku_set = set(skus)
+    
     # Collect ALL standalone description lines in the table area (not just after last SKU)
     # Descriptions can appear between SKUs or after the last one
     for i in range(table_start + 1, min(max_sku_pos + 15, len(lines))):
         candidate = lines[i].strip()
         
         # Stop at end-of-table markers
-        if any(marker in candidate for marker in ["ΣΚΟΠΟΣ ΔΙΑΚΙΝΗΣΗΣ", "ΤΟΠΟΣ ΑΠΟΣΤΟΛΗΣ", "ΣΧΟΛΙΑ", "Συνολική", "ΤΗΛΕΦΩΝΟ:", "ΠΟΛΗ:"]):
+        if any(marker in candidate for marker in TABLE_END_MARKERS):
             break
         
         # Skip if it's a SKU line (standalone or at start of line)
         if SKU_RE.match(candidate):
             continue
         parts = candidate.split()
-        if parts and SKU_RE.match(parts[0]) and parts[0] in [str(s) for s in skus]:
+        if parts and SKU_RE.match(parts[0]) and parts[0] in sku_set:
             continue
         
         # Skip table headers, labels, and serials
-        if candidate in ["Ώρα", "Μ.Μ.", "Περιγραφή", "Ποσότητα", "Τιμή Μονάδος", "Σειρά", "TMX"]:
+        if candidate in TABLE_LABELS:
             continue
         if "Σειριακός" in candidate or "σειριακός" in candidate.lower():
             continue
@@ -174,67 +261,94 @@ def parse_items(lines, phone_to_exclude=""):
             continue
         
         # If it contains letters and looks like a product description
-        if re.search(r"[A-Za-zΑ-Ωα-ω]", candidate) and len(candidate) > 3:
+        if LETTER_RE.search(candidate) and len(candidate) > 3:
             # Common product keywords
-            if any(keyword in candidate.upper() for keyword in ["APPLE", "IPHONE", "CHARGER", "CABLE", "CASE", "USB", "SAMSUNG", "MAC", "JBL", "SPEAKER", "EARPODS", "HANDSFREE", "PORTABLE"]):
+            if PRODUCT_KEYWORDS_RE.search(upper_lines[i]):
                 standalone_descriptions.append((i, candidate))  # Store with line number
     
     # Match standalone descriptions to SKUs by proximity
     # For each SKU without a description, find the nearest description line
+    # Descriptions were collected in line order, so bisect to the SKU's line
+    # and walk outwards past already-used texts; on a tie the earlier line wins
     skus_without_desc = [sku for sku in skus if sku not in product_descriptions]
+    desc_lines = [desc_line for desc_line, _ in standalone_descriptions]
+    n_descs = len(desc_lines)
+    # How many SKUs currently hold each description text (a SKU listed twice is
+    # re-matched, replacing its first pick), for O(1) "already used" checks
+    used = Counter(product_descriptions.values())
     for sku in skus_without_desc:
         sku_line = sku_positions[sku]
-        # Find closest description (prefer one right after, but also check before)
-        best_desc = None
-        min_distance = float('inf')
-        for desc_line, desc_text in standalone_descriptions:
-            distance = abs(desc_line - sku_line)
-            if distance < min_distance and desc_text not in product_descriptions.values():
-                min_distance = distance
-                best_desc = desc_text
-        if best_desc:
-            product_descriptions[sku] = best_desc
+        right = bisect_left(desc_lines, sku_line)
+        left = right - 1
+        while left >= 0 and used[standalone_descriptions[left][1]]:
+            left -= 1
+        while right < n_descs and used[standalone_descriptions[right][1]]:
+            right += 1
+        if left >= 0 and (right >= n_descs or sku_line - desc_lines[left] <= desc_lines[right] - sku_line):
+            best_desc = standalone_descriptions[left][1]
+        elif right < n_descs:
+            best_desc = standalone_descriptions[right][1]
+        else:
+            continue
+        previous = product_descriptions.get(sku)
+        if previous is not None:
+            used[previous] -= 1
+        product_descriptions[sku] = best_desc
+        used[best_desc] += 1
     
     # Collect all prices in the entire document (PDFMiner may extract in non-sequential order)
+    # One bytes scan over the joined text: amounts never span a newline, and
+    # float() parses the matched bytes directly
     all_prices = []
-    for i, line in enumerate(lines):
-        for m in MONEY_RE.findall(line):
-            t = m.replace(".", "").replace(",", ".")
-            try:
-                val = float(t)
-                # Only consider reasonable product prices
-                if 10 <= val <= 10000:  # Products typically cost between 10 and 10,000
-                    all_prices.append(val)
-            except:
-                pass
+    for m in MONEY_BYTES_RE.findall("\n".join(lines).encode("utf-8")):
+        t = m.replace(b".", b"").replace(b",", b".")
+        try:
+            val = float(t)
+            # Only consider reasonable product prices
+            if 10 <= val <= 10000:  # Products typically cost between 10 and 10,000
+                all_prices.append(val)
+        except:
+            pass
     
     # Remove duplicates and sort descending
     all_prices = sorted(list(set(all_prices)), reverse=True)
     
     # Filter out non-product prices:
     # 1. Remove VAT amounts (typically 19% of another price)
-    def is_vat(price, prices, vat_rate=0.19):
-        for base in prices:
-            if base != price and abs(price - base * vat_rate) < 0.5:
+    # Only bases within (price ± 0.5) / vat_rate can match, so bisect the
+    # ascending prices for that window instead of scanning every base
+    ascending = all_prices[::-1]
+
+    def is_vat(price, prices, vat_rate=0.19, tol=0.5):
+        lo = bisect_left(ascending, (price - tol) / vat_rate - 0.01)
+        hi = bisect_right(ascending, (price + tol) / vat_rate + 0.01)
+        for base in ascending[lo:hi]:
+            if base != price and abs(price - base * vat_rate) < tol:
                 return True
         return False
     
-    # 2. Remove sums (totals and subtotals) - check for sums of 2 or more prices
-    def is_sum(price, prices):
-        from itertools import combinations
-        # Check sums of 2 prices
-        for i, p1 in enumerate(prices):
-            for p2 in prices[i+1:]:
-                if p1 != price and p2 != price and abs(price - (p1 + p2)) < 1:
-                    return True
-        # Check sums of 3+ prices (for multi-product subtotals)
-        if len(prices) >= 4:
-            for count in range(3, min(len(prices), 10)):
-                for combo in combinations([p for p in prices if p != price], count):
-                    if abs(price - sum(combo)) < 1:
-                        return True
-        return False
-    
+    # 2. Remove sums (totals and subtotals) - check for sums of 2 to 9 other prices
+    # Subset-sum over integer cents: reach[k] is a bitset of the sums of exactly
+    # k prices, so each price costs a few bigint shifts instead of combinations()
+    cents = {p: round(p * 100) for p in all_prices}
+
+    def is_sum(price, prices, max_terms=9, tol=99):
+        target = cents[price]
+        limit = target + tol
+        mask = (1 << (limit + 1)) - 1
+        reach = [1] + [0] * max_terms
+        for p in prices:
+            if p == price:
+                continue
+            c = cents[p]
+            if c > limit:
+                continue
+            for k in range(max_terms, 0, -1):
+                if reach[k - 1]:
+                    reach[k] = (reach[k] | (reach[k - 1] << c)) & mask
+        window = mask >> max(target - tol, 0) << max(target - tol, 0)
+        return any(r & window for r in reach[2:])
+
     product_prices = []
     for price in all_prices:
         if not is_vat(price, all_prices) and not is_sum(price, all_prices):
@@ -298,49 +412,17 @@ def parse_items(lines, phone_to_exclude=""):
 
 
 # CST PATTERNS
-CST_SHORT_RE = re.compile(r"^[A-Za-zΑ-Ωα-ω]{1,2}\d$")          # P2, A7, Δ5
-CST_10DIGIT_RE = re.compile(r"^\d{10}$")                       # 10 digits
-CST_CB_RE = re.compile(r"^C[ΒB]\d{8}$")                        # CΒ + 8 digits
-
-DATE_RE = re.compile(r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b")     # reject dates
-
-
-def is_valid_cst(candidate: str) -> bool:
-    candidate = candidate.strip()
-
-    # Reject obvious junk
-    if not candidate or len(candidate) > 12:
-        return False
-    if "/" in candidate or "-" in candidate:  # dates
-        return False
-    if DATE_RE.fullmatch(candidate):
-        return False
-
-    # Valid formats:
-    if CST_SHORT_RE.fullmatch(candidate):   # P2
-        return True
-    if CST_10DIGIT_RE.fullmatch(candidate): # 10 digits
-        return True
-    if CST_CB_RE.fullmatch(candidate):      # CΒ12345678
-        return True
-
-    return False
+# One alternation for the three accepted shapes; none of them can contain
+# "/" or "-", so dates are rejected without a separate check
+CST_ANY = r"[A-Za-zΑ-Ωα-ω]{1,2}\d|\d{10}|C[ΒB]\d{8}"  # P2 / A7 / Δ5, 10 digits, CΒ + 8 digits
+# The accepted shapes as whole whitespace-delimited tokens inside a text
+CST_TOKEN_RE = re.compile(rf"(?<!\S)(?:{CST_ANY})(?!\S)")
 
 
 def extract_cst(lines, full):
-    # Search line-by-line for valid CST candidates
-    for ln in lines:
-        parts = ln.split()
-        for token in parts:
-            if is_valid_cst(token):
-                return token
-
-    # fallback: full text token scan
-    for token in re.split(r"\s+", full):
-        if is_valid_cst(token):
-            return token
-
-    return ""
+    # First valid token in reading order (full is the lines joined by "\n")
+    m = CST_TOKEN_RE.search(full)
+    return m.group(0) if m else ""
 
 
 def extract_invoice(lines, full):
@@ -359,13 +441,13 @@ def extract_invoice(lines, full):
     return ""
 
 
-def extract_serial(lines, full):
+def extract_serial(lines, full, no_space):
     """Extract serial number - handles both inline and separate line formats"""
     # Find all serial numbers in the document
     serials = []
-    for line in lines:
+    for line, compact in zip(lines, no_space):
         if "Σειριακός" in line or "σειριακός" in line.lower():
-            m = SERIAL_RE.search(line.replace(" ", ""))
+            m = SERIAL_RE.search(compact)
             if m:
                 serials.append(m.group(1))
     
@@ -373,7 +455,7 @@ def extract_serial(lines, full):
     return serials[0] if serials else ""
 
 
-def extract_name_phone_new_format(lines):
+def extract_name_phone_new_format(lines, no_space_full):
     """Extract name and phone from new format"""
     name, surname, phone = "", "", ""
     
@@ -400,7 +482,7 @@ def extract_name_phone_new_format(lines):
                 
                 # Check if it looks like a name part
                 # Accept lines with only letters, spaces, and basic punctuation
-                if candidate and re.match(r"^[A-Za-zΑ-Ωα-ωΪΫϊϋΐΰάέήίόύώΆΈΉΊΌΎΏ\.\-\s]+$", candidate):
+                if candidate and NAME_CHARS_RE.match(candidate):
                     # It's a name part - could be single or multiple words
                     name_parts.append(candidate)
                     # Stop after collecting 2 name segments (even if one has multiple words)
@@ -425,25 +507,21 @@ def extract_name_phone_new_format(lines):
     
     # Look for phone - scan entire document for 8-digit phone pattern (with or without +)
     # First try the standard 8-digit Cyprus format
-    for line in lines:
-        m = PHONE8_RE.search(line.replace(" ", ""))
-        if m:
-            phone = m.group(1)
-            break
+    m = PHONE8_RE.search(no_space_full)
+    if m:
+        phone = m.group(1)
     
     # If no Cyprus phone found, look for international format (starts with +)
     if not phone:
-        for line in lines:
-            # Match international phone: + followed by 10-15 digits
-            m = re.search(r'\+(\d{10,15})', line.replace(" ", ""))
-            if m:
-                phone = m.group(0)  # Keep the + prefix
-                break
+        # Match international phone: + followed by 10-15 digits
+        m = INTL_PHONE_RE.search(no_space_full)
+        if m:
+            phone = m.group(0)  # Keep the + prefix
     
     return name, surname, phone
 
 
-def extract_name_phone_old_format(lines):
+def extract_name_phone_old_format(lines, no_space):
     """Extract name and phone from old format"""
     name, surname, phone = "", "", ""
     
@@ -466,7 +544,7 @@ def extract_name_phone_old_format(lines):
         # Look for phone
         for i in range(anchor, min(len(lines), anchor + 15)):
             if "Τηλέφωνο:" in lines[i]:
-                m = PHONE8_RE.search(lines[i].replace(" ", ""))
+                m = PHONE8_RE.search(no_space[i])
                 if m:
                     phone = m.group(1)
                     break
@@ -474,9 +552,44 @@ def extract_name_phone_old_format(lines):
     return name, surname, phone
 
 
-def extract(pdf_path: str):
-    lines = get_lines(pdf_path)
-    full = "\n".join(lines)
+# Once these header fields are found, trailing pages (attachments, T&Cs) are not parsed
+HEADER_FIELDS = ("invoice", "name", "phone", "cst code")
+
+
+def extract(pdf_path, fast=True):
+    """
+    Extract invoice fields from a PDF path or binary stream
+    `fast=False` skips the PyMuPDF text pass and uses pdfminer's layout.
+    Parsed page by page: only the cheap header fields are re-scanned after
+    each page, stopping once they are all filled; items and serial are
+    parsed once, on the pages read
+    """
+    lines = []
+    header = None
+    pages = iter_page_lines(pdf_path, fast)
+    try:
+        for page_lines in pages:
+            lines.extend(page_lines)
+            header = extract_header(lines)
+            if all(header[k] for k in HEADER_FIELDS):
+                break
+    finally:
+        pages.close()
+    return extract_from_lines(lines, header)
+
+
+def _line_texts(lines):
+    """
+    Full text plus space-free copies for the digit scanners, built once;
+    lines are joined with "\n" so a match can never run across two lines
+    """
+    no_space = tuple(line.replace(" ", "") for line in lines)
+    return "\n".join(lines), no_space, "\n".join(no_space)
+
+
+def extract_header(lines, texts=None):
+    """Invoice number, customer name/phone and CST code from text lines"""
+    full, no_space, no_space_full = texts or _line_texts(lines)
 
     # Detect format by checking for old format markers
     is_old_format = any("Στοιχεία Πελάτη" in line for line in lines)
@@ -489,9 +602,9 @@ def extract(pdf_path: str):
     
     # Extract name and phone based on format (do this FIRST to get phone)
     if is_old_format:
-        name, surname, phone = extract_name_phone_old_format(lines)
+        name, surname, phone = extract_name_phone_old_format(lines, no_space)
     else:
-        name, surname, phone = extract_name_phone_new_format(lines)
+        name, surname, phone = extract_name_phone_new_format(lines, no_space_full)
     
     # Fallback: try to find name anywhere if still empty
     if not name:
@@ -509,11 +622,29 @@ def extract(pdf_path: str):
     
     # Fallback: try to find phone anywhere if still empty
     if not phone:
-        for line in lines:
-            m = PHONE8_RE.search(line.replace(" ", ""))
-            if m:
-                phone = m.group(1)
-                break
+        m = PHONE8_RE.search(no_space_full)
+        if m:
+            phone = m.group(1)
+
+    return {
+        "name": name,
+        "surname": surname,
+        "phone": phone,
+        "invoice": invoice,
+        "cst code": cst,
+    }
+
+
+def extract_from_lines(lines, header=None):
+    """
+    Extract invoice fields from already-extracted text lines
+    `header` is a precomputed extract_header(lines) result
+    """
+    texts = _line_texts(lines)
+    full, no_space, _ = texts
+    if header is None:
+        header = extract_header(lines, texts)
+    phone = header["phone"]
 
     # Extract items → pick highest gross price (pass phone to avoid confusion)
     items = parse_items(lines, phone_to_exclude=phone)
@@ -523,14 +654,10 @@ def extract(pdf_path: str):
         material, product = best["sku"], best["desc"]
     
     # Extract serial number
-    serial = extract_serial(lines, full)
+    serial = extract_serial(lines, full, no_space)
 
     return {
-        "name": name,
-        "surname": surname,
-        "phone": phone,
-        "invoice": invoice,
-        "cst code": cst,
+        **header,
         "material": material,
         "product": product,
         "serial": serial
@@ -4,119 +4,456 @@ Railway-compatible Selenium Chrome setup with configurable headless mode
 FIXED: Added critical flags for Railway environment
 """
 import os
+import copy
+import time
+import shlex
+import itertools
+import queue
+import atexit
 import logging
+import weakref
+import threading
+import subprocess
+import urllib.request
+from concurrent.futures import Future, wait as wait_futures
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
 from selenium import webdriver
+from selenium.common.exceptions import JavascriptException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
 
 logger = logging.getLogger(__name__)
 
+# Requests Chrome never needs to make for the CRM's forms: web fonts, media,
+# ads and trackers. Stylesheets stay allowed - the automation relies on CSS
+# visibility (modals, select2, blockUI overlays).
+BLOCKED_URL_PATTERNS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*",
+    "*doubleclick.net*", "*connect.facebook.net*", "*hotjar.com*",
+]
+IMAGE_URL_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico"]
 
-def get_chrome_driver(headless=True):
+# Pooled drivers are quit and relaunched after this many jobs (0 = never)
+MAX_USES_PER_INSTANCE = int(os.getenv('MAX_USES_PER_INSTANCE', '50'))
+
+# Below this much free /dev/shm (MB) Chrome is told to keep shared memory in
+# /tmp instead (--disable-dev-shm-usage); Docker's default 64 MB is too small
+SHM_MIN_MB = int(os.getenv('SHM_MIN_MB', '256'))
+
+# Per-operation timeouts (seconds). With 'eager' loading driver.get returns at
+# DOMContentLoaded, so a page that takes longer than this is stuck, not slow.
+PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+SCRIPT_TIMEOUT = int(os.getenv('SCRIPT_TIMEOUT', '10'))
+# Page.navigate answers once the response is in, so a new document commits
+# within moments; one that has not after this long never will (204, download)
+NAV_COMMIT_GRACE = 1.0
+
+# chromedriver logging is off (no per-command log writes) unless
+# CHROMEDRIVER_LOG_LEVEL is set (DEBUG/INFO/WARNING/SEVERE); then it goes to
+# CHROMEDRIVER_LOG, which is dumped into the log when a launch fails
+CHROMEDRIVER_LOG = '/tmp/chromedriver.log'
+CHROMEDRIVER_LOG_LEVEL = os.getenv('CHROMEDRIVER_LOG_LEVEL', 'OFF').upper()
+
+# Environment defaults for get_driver_from_env, read once at import
+_HEADLESS_ENV = os.getenv('HEADLESS', 'true').lower()
+_DEFAULT_HEADLESS = _HEADLESS_ENV in ('true', '1', 'yes')
+_DEFAULT_LOAD_STRATEGY = os.getenv('PAGE_LOAD_STRATEGY', 'eager').lower()
+_DEFAULT_SHARED = os.getenv('SHARED_BROWSER', 'false').lower() in ('true', '1', 'yes')
+
+# Launch attempts per driver, and the circuit breaker: after this many failed
+# launches (each after its retries) within the window, launches fail at once
+LAUNCH_ATTEMPTS = 3
+LAUNCH_FAILURE_LIMIT = int(os.getenv('LAUNCH_FAILURE_LIMIT', '3'))
+LAUNCH_FAILURE_WINDOW = 60
+_launch_failures = deque()
+_launch_failures_lock = threading.Lock()
+
+# Keep-alive connections per driver to chromedriver (urllib3's default is 1,
+# so concurrent commands on one driver queue and churn connections)
+SELENIUM_POOL_MAXSIZE = int(os.getenv('SELENIUM_POOL_MAXSIZE', '20'))
+
+
+# ========== CHROME FLAGS ==========
+HEADLESS_FLAGS = (
+    '--headless=new',  # New headless mode
+    '--disable-gpu',
+)
+HEADED_FLAGS = (
+    '--start-maximized',
+)
+# chrome-headless-shell is headless-only and predates --headless=new
+HEADLESS_SHELL_FLAGS = (
+    '--headless',
+    '--disable-gpu',
+)
+BASE_FLAGS = (
+    # CRITICAL: Essential arguments for Railway/containerized environments
+    '--no-sandbox',  # CRITICAL for Docker
+    '--disable-software-rasterizer',
+    '--disable-extensions',
+    '--disable-setuid-sandbox',  # Additional sandbox bypass
+    # Additional stability flags for Railway
+    '--disable-features=VizDisplayCompositor',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-breakpad',
+    '--disable-client-side-phishing-detection',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-default-apps',
+    '--disable-ipc-flooding-protection',
+    '--disable-renderer-backgrounding',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    # Performance optimizations
+    '--disable-logging',
+    '--log-level=3',
+    '--silent',
+    # Anti-detection features (from original code)
+    '--disable-blink-features=AutomationControlled',
+    '--disable-notifications',
+    # User agent to avoid detection
+    '--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    # Window size for consistent rendering
+    '--window-size=1920,1080',
+)
+# One Chrome process per driver instead of zygote + renderer/GPU/utility
+# children: several times less RSS on small containers, but one crashing
+# page takes the whole browser down. LOW_MEMORY=false for multi-process.
+LOW_MEMORY_FLAGS = (
+    '--single-process',  # Run in single process mode
+    '--no-zygote',  # CRITICAL for single process
+    '--renderer-process-limit=1',
+    '--disable-gpu-compositing',
+)
+LOW_MEMORY = os.getenv('LOW_MEMORY', 'true').lower() in ('true', '1', 'yes')
+# Extra switches appended to every launch, e.g. EXTRA_CHROME_FLAGS="--lang=el --disable-sync"
+EXTRA_CHROME_FLAGS = tuple(shlex.split(os.getenv('EXTRA_CHROME_FLAGS', '')))
+
+
+ChromePaths = namedtuple('ChromePaths', 'binary driver')
+
+
+@lru_cache(maxsize=1)
+def _resolve_paths():
+    """
+    Chrome binary and chromedriver from GOOGLE_CHROME_BIN / CHROMEDRIVER_PATH,
+    probed once per process; None where the file is missing (Selenium finds it).
+    _resolve_paths.cache_clear() (and _options_prototype.cache_clear()) re-reads
+    them after the env changes
+    """
+    chrome_bin = os.getenv('GOOGLE_CHROME_BIN', '/usr/bin/google-chrome')
+    chromedriver_path = os.getenv('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver')
+    return ChromePaths(
+        binary=chrome_bin if os.path.exists(chrome_bin) else None,
+        driver=chromedriver_path if os.path.exists(chromedriver_path) else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def _options_prototype(headless, load_images, load_strategy):
+    """Chrome Options for one launch shape, built once; callers deepcopy it"""
+    chrome_options = Options()
+    
+    binary = _resolve_paths().binary
+    if _is_headless_shell(binary):
+        mode_flags = HEADLESS_SHELL_FLAGS
+    else:
+        mode_flags = HEADLESS_FLAGS if headless else HEADED_FLAGS
+    for flag in itertools.chain(mode_flags, BASE_FLAGS,
+                                LOW_MEMORY_FLAGS if LOW_MEMORY else (), EXTRA_CHROME_FLAGS):
+        chrome_options.add_argument(flag)
+    
+    # Content settings: 2 = block. Third-party cookies stay on (the login captcha needs them).
+    prefs = {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_setting_values.geolocation": 2,
+        "profile.default_content_setting_values.media_stream_mic": 2,
+        "profile.default_content_setting_values.media_stream_camera": 2,
+        "profile.default_content_setting_values.automatic_downloads": 2,
+    }
+    if not load_images:
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')  # Forms only, skip image decode
+        prefs["profile.managed_default_content_settings.images"] = 2
+    chrome_options.add_experimental_option("prefs", prefs)
+    # 'eager': driver.get returns on DOMContentLoaded; callers wait for the elements they need
+    chrome_options.page_load_strategy = load_strategy
+    
+    # Anti-detection features (from original code)
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    if binary:
+        chrome_options.binary_location = binary
+    return chrome_options
+
+
+def _is_headless_shell(binary):
+    """Is `binary` Chrome for Testing's chrome-headless-shell build"""
+    return bool(binary) and 'headless-shell' in os.path.basename(binary)
+
+
+def get_chrome_driver(headless=True, load_images=False, load_strategy='eager', shared=False):
     """
     Get Chrome WebDriver configured for Railway deployment
     
     Args:
         headless: Run headlessly (True) or with GUI (False) for debugging
+        load_images: Fetch and decode images (off by default: forms only)
+        load_strategy: Selenium pageLoadStrategy; 'normal' waits for every subresource
+        shared: Open an isolated tab in the one shared Chrome instead of a new browser
     
     Returns:
         Configured Chrome WebDriver instance
     """
     logger.info(f"Initializing Chrome WebDriver (headless={headless})...")
     
-    chrome_options = Options()
+    paths = _resolve_paths()
+    if not headless and _is_headless_shell(paths.binary):
+        raise ValueError(f"{paths.binary} is headless-only; set HEADLESS=true "
+                         "or point GOOGLE_CHROME_BIN at full Chrome")
     
     # Headless configuration
     if headless:
-        chrome_options.add_argument('--headless=new')  # New headless mode
-        chrome_options.add_argument('--disable-gpu')
         logger.info("Running in headless mode")
     else:
-        chrome_options.add_argument("--start-maximized")
         logger.info("Running in headed mode")
+    # Copy of the prebuilt options for this shape: webdriver.Chrome mutates
+    # the Options it is given, and only the /dev/shm switch varies per launch
+    chrome_options = copy.deepcopy(_options_prototype(headless, load_images, load_strategy))
     
-    # CRITICAL: Essential arguments for Railway/containerized environments
-    chrome_options.add_argument('--no-sandbox')  # CRITICAL for Docker
-    chrome_options.add_argument('--disable-dev-shm-usage')  # CRITICAL for limited /dev/shm
-    chrome_options.add_argument('--disable-software-rasterizer')
-    chrome_options.add_argument('--disable-extensions')
-    chrome_options.add_argument('--disable-setuid-sandbox')  # Additional sandbox bypass
-    
-    # Additional stability flags for Railway
-    chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-    chrome_options.add_argument('--single-process')  # Run in single process mode
-    chrome_options.add_argument('--disable-background-networking')
-    chrome_options.add_argument('--disable-background-timer-throttling')
-    chrome_options.add_argument('--disable-breakpad')
-    chrome_options.add_argument('--disable-client-side-phishing-detection')
-    chrome_options.add_argument('--disable-component-extensions-with-background-pages')
-    chrome_options.add_argument('--disable-default-apps')
-    chrome_options.add_argument('--disable-ipc-flooding-protection')
-    chrome_options.add_argument('--disable-renderer-backgrounding')
-    chrome_options.add_argument('--metrics-recording-only')
-    chrome_options.add_argument('--mute-audio')
-    chrome_options.add_argument('--no-first-run')
-    chrome_options.add_argument('--no-zygote')  # CRITICAL for single process
-    
-    # Performance optimizations
-    chrome_options.add_argument('--disable-logging')
-    chrome_options.add_argument('--log-level=3')
-    chrome_options.add_argument('--silent')
-    
-    # Anti-detection features (from original code)
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('--disable-notifications')
-    
-    # User agent to avoid detection
-    chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-    
-    # Window size for consistent rendering
-    chrome_options.add_argument('--window-size=1920,1080')
+    shm_mb = _dev_shm_free_mb()
+    if shm_mb < SHM_MIN_MB:
+        chrome_options.add_argument('--disable-dev-shm-usage')  # CRITICAL for limited /dev/shm
+        logger.info(f"/dev/shm has {shm_mb:.0f} MB free, using /tmp for shared memory")
     
     # Binary location - Railway uses system Chrome
-    chrome_bin = os.getenv('GOOGLE_CHROME_BIN', '/usr/bin/google-chrome')
-    if os.path.exists(chrome_bin):
-        chrome_options.binary_location = chrome_bin
-        logger.info(f"Using Chrome binary: {chrome_bin}")
+    if paths.binary:
+        logger.info(f"Using Chrome binary: {paths.binary}")
     else:
         logger.info("Using default Chrome binary (system will find it)")
     
     # ChromeDriver path - Railway uses system chromedriver
-    chromedriver_path = os.getenv('CHROMEDRIVER_PATH', '/usr/local/bin/chromedriver')
+    chromedriver_path = paths.driver or _detected_driver_path
     
     try:
-        # Try with explicit path first
-        if os.path.exists(chromedriver_path):
-            service = Service(
-                executable_path=chromedriver_path,
-                log_path='/tmp/chromedriver.log'  # Verbose logging for debugging
-            )
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info(f"Chrome driver initialized with path: {chromedriver_path}")
-        else:
-            # Fallback: let selenium find it
-            logger.info("ChromeDriver not found at expected path, using auto-detection")
-            service = Service(log_path='/tmp/chromedriver.log')
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info("Chrome driver initialized with auto-detection")
+        driver = _launch_with_backoff(chrome_options, chromedriver_path, shared)
+        _widen_http_pool(driver)
         
-        # Set page load timeout
-        driver.set_page_load_timeout(120)
+        # Fail fast; waits are explicit (WebDriverWait), never implicit
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        driver.implicitly_wait(0)
+
+        # Drop font/tracker (and image) requests at the network layer
+        blocked = BLOCKED_URL_PATTERNS if load_images else BLOCKED_URL_PATTERNS + IMAGE_URL_PATTERNS
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        except Exception as e:
+            logger.warning(f"⚠ Could not set blocked URLs: {e}")
         
         logger.info("✓ Chrome WebDriver initialized successfully")
         return driver
         
     except Exception as e:
         logger.error(f"Failed to initialize Chrome driver: {e}")
-        # Log chromedriver verbose output if available
+        # Log chromedriver verbose output if this launch wrote any (with
+        # logging off the file is at best a stale one from an earlier run)
+        if CHROMEDRIVER_LOG_LEVEL != 'OFF':
+            try:
+                with open(CHROMEDRIVER_LOG, 'r') as f:
+                    logger.error(f"ChromeDriver log:\n{f.read()}")
+            except OSError:
+                pass
+        raise
+
+
+def _start_driver(chrome_options, chromedriver_path, shared):
+    """One launch attempt: a new Chrome (or shared-browser tab) answering on DevTools"""
+    # keep_alive=True: every command reuses the executor's single urllib3
+    # PoolManager instead of opening a connection per command
+    if shared:
+        driver = _open_shared_tab(chrome_options, chromedriver_path)
+        logger.info("Chrome driver attached to the shared browser")
+    # Try with explicit path first
+    elif chromedriver_path:
+        driver = webdriver.Chrome(service=_new_service(chromedriver_path), options=chrome_options, keep_alive=True)
+        logger.info(f"Chrome driver initialized with path: {chromedriver_path}")
+    else:
+        # Fallback: let selenium find it
+        logger.info("ChromeDriver not found at expected path, using auto-detection")
+        driver = webdriver.Chrome(service=_new_service(None), options=chrome_options, keep_alive=True)
+        logger.info("Chrome driver initialized with auto-detection")
+        _remember_driver_path(driver)
+    if not shared:
+        _probe_devtools(driver)
+    return driver
+
+
+def _launch_with_backoff(chrome_options, chromedriver_path, shared):
+    """
+    _start_driver, retried with exponential backoff (0.2 s, 0.4 s, ...)
+    Behind a circuit breaker: after LAUNCH_FAILURE_LIMIT failed launches within
+    LAUNCH_FAILURE_WINDOW seconds, further launches fail at once instead of
+    spending seconds on a Chrome that keeps crashing
+    """
+    with _launch_failures_lock:
+        cutoff = time.monotonic() - LAUNCH_FAILURE_WINDOW
+        while _launch_failures and _launch_failures[0] < cutoff:
+            _launch_failures.popleft()
+        if LAUNCH_FAILURE_LIMIT and len(_launch_failures) >= LAUNCH_FAILURE_LIMIT:
+            raise WebDriverException(f"Chrome launch circuit open: {len(_launch_failures)} failed "
+                                     f"launches in the last {LAUNCH_FAILURE_WINDOW}s")
+    for attempt in range(1, LAUNCH_ATTEMPTS + 1):
         try:
-            with open('/tmp/chromedriver.log', 'r') as f:
-                logger.error(f"ChromeDriver log:\n{f.read()}")
-        except:
+            driver = _start_driver(chrome_options, chromedriver_path, shared)
+        except (WebDriverException, RuntimeError, OSError) as e:
+            if attempt == LAUNCH_ATTEMPTS:
+                with _launch_failures_lock:
+                    _launch_failures.append(time.monotonic())
+                raise
+            logger.warning(f"⚠ Chrome launch attempt {attempt}/{LAUNCH_ATTEMPTS} failed, retrying: {e}")
+            time.sleep(0.2 * 2 ** (attempt - 1))
+        else:
+            with _launch_failures_lock:
+                _launch_failures.clear()
+            return driver
+
+
+# chromedriver that Selenium Manager found on the first auto-detected launch;
+# later launches pass it explicitly instead of re-running the lookup
+_detected_driver_path: Optional[str] = None
+
+
+def _remember_driver_path(driver):
+    global _detected_driver_path
+    path = getattr(driver.service, 'path', None)
+    if path and os.path.exists(path):
+        _detected_driver_path = path
+        logger.info(f"Caching auto-detected chromedriver: {path}")
+
+
+def _new_service(chromedriver_path):
+    """chromedriver Service at `chromedriver_path`, or auto-detected when None"""
+    if CHROMEDRIVER_LOG_LEVEL == 'OFF':
+        log_output = subprocess.DEVNULL
+    else:
+        log_output = CHROMEDRIVER_LOG
+    return Service(executable_path=chromedriver_path, log_output=log_output,
+                   service_args=[f'--log-level={CHROMEDRIVER_LOG_LEVEL}'])
+
+
+def _probe_devtools(driver, timeout=2):
+    """
+    Check the new Chrome answers on its DevTools port (chromedriver launches
+    it with --remote-debugging-port=0 and reports the picked port as
+    debuggerAddress); a browser that came up half-broken is quit right away
+    instead of failing later on the first page-load timeout
+    """
+    address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+    if not address:
+        return
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout):
             pass
-        raise
+    except Exception as e:
+        _quit_quietly(driver)
+        raise WebDriverException(f"Chrome DevTools not reachable at {address}: {e}") from e
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def navigate(driver, url, timeout=PAGE_LOAD_TIMEOUT):
+    """
+    driver.get via CDP Page.navigate: returns once the new document has
+    reached DOMContentLoaded (like 'eager'), polled under our own timeout
+    instead of one blocking chromedriver call; a failed navigation
+    (DNS, refused, ...) raises at once rather than waiting out the timeout.
+    A response that commits no document (HTTP 204/205, a download or
+    Content-Disposition: attachment) leaves the old page in place: that is
+    noticed from the frame's loaderId after NAV_COMMIT_GRACE and returns.
+    A same-document navigation (#fragment) returns immediately
+    """
+    # The old document carries the marker, the new one does not
+    driver.execute_script("window.__navPending = true")
+    result = driver.execute_cdp_cmd("Page.navigate", {"url": url})
+    if result.get("errorText"):
+        raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+    loader_id = result.get("loaderId")
+    if not loader_id:
+        return  # same-document navigation (#fragment): nothing to load
+    commit_deadline = time.monotonic() + NAV_COMMIT_GRACE
+    committed = False
+
+    def loaded(d):
+        nonlocal committed
+        if d.execute_script("return !window.__navPending && document.readyState !== 'loading'"):
+            return True
+        if committed or time.monotonic() < commit_deadline:
+            return False
+        # Done if the frame never took the new loader; once it has, only the
+        # new document's loading is left to wait for
+        frame = d.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]
+        if frame.get("loaderId") != loader_id:
+            logger.debug("Navigation to %s committed no document", url)
+            return True
+        committed = True
+        return False
+
+    WebDriverWait(driver, timeout, poll_frequency=0.05,
+                  ignored_exceptions=(JavascriptException,)).until(
+        loaded, message=f"Timed out loading {url}")
+
+
+def get_fully_loaded(driver, url, timeout=PAGE_LOAD_TIMEOUT):
+    """
+    driver.get for the rare page that needs its `load` event ('normal'
+    strategy) - the session's strategy is fixed at creation, so wait for
+    document.readyState == 'complete' after the eager return
+    """
+    driver.get(url)
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+        lambda d: d.execute_script("return document.readyState") == "complete")
+
+
+def _dev_shm_free_mb():
+    """Free space on /dev/shm in MB (0 when it is missing)"""
+    try:
+        st = os.statvfs('/dev/shm')
+    except (OSError, AttributeError):
+        return 0
+    return st.f_bavail * st.f_frsize / 1e6
+
+
+def _widen_http_pool(driver, maxsize=SELENIUM_POOL_MAXSIZE):
+    """
+    Swap the driver's urllib3 PoolManager for one holding `maxsize` connections
+    webdriver.Chrome takes no client_config, so the executor's config is
+    updated and its connection manager rebuilt (Selenium 4 RemoteConnection)
+    """
+    executor = driver.command_executor
+    try:
+        executor.client_config.init_args_for_pool_manager = {
+            "init_args_for_pool_manager": {"maxsize": maxsize, "block": False},
+        }
+        old = getattr(executor, "_conn", None)
+        executor._conn = executor._get_connection_manager()
+        if old is not None:
+            old.clear()
+    except Exception as e:
+        logger.warning(f"⚠ Could not resize Selenium connection pool: {e}")
 
 
 def get_driver_from_env():
@@ -126,11 +463,238 @@ def get_driver_from_env():
     Set HEADLESS=false in Railway for debugging (won't show browser but helps troubleshooting)
     Default is headless mode (HEADLESS=true or not set)
     """
-    headless_str = os.getenv('HEADLESS', 'true').lower()
-    headless = headless_str in ('true', '1', 'yes')
-    
-    logger.info(f"HEADLESS env var: '{headless_str}' -> headless={headless}")
-    return get_chrome_driver(headless=headless)
+    logger.info(f"HEADLESS env var: '{_HEADLESS_ENV}' -> headless={_DEFAULT_HEADLESS}")
+    return get_chrome_driver(headless=_DEFAULT_HEADLESS, load_strategy=_DEFAULT_LOAD_STRATEGY,
+                             shared=_DEFAULT_SHARED)
+
+
+# ========== SHARED BROWSER (CDP MULTI-TAB) ==========
+# With SHARED_BROWSER=true every driver is a chromedriver session attached to
+# one long-lived Chrome, confined to its own browser context (cookies,
+# storage, cache) and tab - one set of browser/GPU/network processes in total.
+SHARED_BROWSER_PORT = int(os.getenv('SHARED_BROWSER_PORT', '9222'))
+SHARED_BROWSER_DIR = os.getenv('SHARED_BROWSER_DIR', '/tmp/chrome-shared')
+_shared_proc = None
+_shared_lock = threading.Lock()
+
+
+class SharedTabDriver(webdriver.Chrome):
+    """Chrome session on the shared browser; quit() closes only its own context"""
+
+    _context_id = None
+    _home_handle = None
+
+    def open_isolated_tab(self):
+        self._home_handle = self.current_window_handle
+        self._context_id = self.execute_cdp_cmd(
+            "Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+        target = self.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self._context_id})
+        # chromedriver window handles are CDP target ids
+        self.switch_to.window(target["targetId"])
+
+    def quit(self):
+        try:
+            if self._context_id:
+                # Dispose from the browser's home tab: it closes this context's tab too
+                self.switch_to.window(self._home_handle)
+                self.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": self._context_id})
+        except Exception as e:
+            logger.debug("Could not dispose browser context: %s", e)
+        finally:
+            self._context_id = None
+            super().quit()  # ends the attached session; the shared Chrome keeps running
+
+
+def _shared_browser_ready():
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{SHARED_BROWSER_PORT}/json/version", timeout=1):
+            return True
+    except Exception:
+        return False
+
+
+def _ensure_shared_browser(chrome_options, timeout=30):
+    """Launch the shared Chrome (same flags as a pooled one) unless it is up"""
+    global _shared_proc
+    with _shared_lock:
+        if _shared_proc is not None and _shared_proc.poll() is None and _shared_browser_ready():
+            return
+        logger.info(f"Launching shared Chrome on port {SHARED_BROWSER_PORT}...")
+        _shared_proc = subprocess.Popen(
+            [chrome_options.binary_location or 'google-chrome', *chrome_options.arguments,
+             f'--remote-debugging-port={SHARED_BROWSER_PORT}',
+             f'--user-data-dir={SHARED_BROWSER_DIR}', 'about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + timeout
+        while not _shared_browser_ready():
+            if _shared_proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("Shared Chrome did not open its DevTools port")
+            time.sleep(0.2)
+        logger.info("✓ Shared Chrome is up")
+
+
+def _open_shared_tab(chrome_options, chromedriver_path):
+    _ensure_shared_browser(chrome_options)
+    attach = Options()
+    attach.debugger_address = f"127.0.0.1:{SHARED_BROWSER_PORT}"
+    attach.page_load_strategy = chrome_options.page_load_strategy
+    driver = SharedTabDriver(service=_new_service(chromedriver_path), options=attach, keep_alive=True)
+    try:
+        driver.open_isolated_tab()
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+@atexit.register
+def _stop_shared_browser():
+    if _shared_proc is not None and _shared_proc.poll() is None:
+        _shared_proc.terminate()
+
+
+# ========== BROWSER POOL ==========
+class BrowserPool:
+    """
+    Process-wide pool of reusable Chrome sessions
+
+    Drivers are launched lazily (up to `size`) and handed back to the pool
+    on release instead of being quit, so only the first batch pays the
+    Chrome cold start. A driver is recycled (quit, and relaunched on demand)
+    after `max_uses` releases, before Chrome's memory creeps up.
+    With size=1 every caller reuses the same driver in turn; a crashed one
+    is replaced on the next acquire().
+    """
+
+    def __init__(self, size: int, max_uses: int = MAX_USES_PER_INSTANCE,
+                 script_timeout: Optional[float] = None):
+        # A single shared driver can only serve one session at a time
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.script_timeout = script_timeout
+        self._uses: "weakref.WeakKeyDictionary[webdriver.Chrome, int]" = weakref.WeakKeyDictionary()
+        self._idle: "queue.Queue[webdriver.Chrome]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._launched = 0
+        self._launch_promise: Optional[Future] = None
+
+    def acquire(self) -> webdriver.Chrome:
+        """Return a live driver from the pool, launching one if needed"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._launch()
+            if driver is None:
+                continue
+            if self._is_alive(driver):
+                return driver
+            logger.warning("⚠ Pooled Chrome session is dead, relaunching...")
+            self._discard(driver)
+
+    def release(self, driver: webdriver.Chrome, reset: bool = True) -> None:
+        """Return a driver to the pool, clearing its cookies unless reset=False"""
+        uses = self._uses.get(driver, 0) + 1
+        if self.max_uses and uses >= self.max_uses:
+            logger.info(f"♻ Recycling pooled Chrome after {uses} uses")
+            self._discard(driver)
+            return
+        self._uses[driver] = uses
+        try:
+            if reset:
+                driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception as e:
+            logger.warning(f"⚠ Could not reset pooled driver, discarding it: {e}")
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+        logger.debug("✓ Driver returned to pool")
+
+    @contextmanager
+    def session(self, reset: bool = True):
+        """
+        `with pool.session() as driver:` - acquire, then release on exit
+        A driver that raised a WebDriverException is discarded, not reused
+        """
+        driver = self.acquire()
+        try:
+            yield driver
+        except WebDriverException:
+            self._discard(driver)
+            raise
+        except BaseException:
+            self.release(driver, reset)
+            raise
+        self.release(driver, reset)
+
+    def drain(self) -> None:
+        """Quit every idle driver (called on shutdown)"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    def _launch(self) -> Optional[webdriver.Chrome]:
+        """
+        Launch a new driver if the pool has capacity
+
+        Only one launch runs at a time; concurrent callers wait for it and
+        then retry the idle queue. Returns None when the caller should retry.
+        """
+        with self._lock:
+            promise = self._launch_promise
+            if promise is None and self._launched < self.size:
+                promise = self._launch_promise = Future()
+                self._launched += 1
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            if promise is not None:
+                wait_futures([promise])
+                return None
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                return None
+
+        logger.info(f"Launching pooled Chrome ({self._launched}/{self.size})...")
+        try:
+            driver = get_driver_from_env()
+            if self.script_timeout is not None:
+                driver.set_script_timeout(self.script_timeout)
+        except Exception as e:
+            with self._lock:
+                self._launched -= 1
+                self._launch_promise = None
+            promise.set_exception(e)
+            raise
+        with self._lock:
+            self._launch_promise = None
+        promise.set_result(None)
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting discarded driver: %s", e)
+        with self._lock:
+            self._launched -= 1
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        """Connected check - detects crashed Chrome sessions"""
+        try:
+            return bool(driver.session_id) and driver.execute_script("return 1") == 1
+        except Exception:
+            return False
 
 
 if __name__ == '__main__':
@@ -4,108 +4,156 @@
 Quick verification script - checks files without requiring dependencies
 """
 import os
+import re
 import sys
+import mmap
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def contains(path, *needles):
+    """
+    Which of `needles` (bytes, or compiled bytes regexes) occur in the file
+    One alternation of all needles sweeps the mmap'd file once, and stops
+    as soon as every needle has been seen
+    """
+    parts = []
+    for i, n in enumerate(needles):
+        if hasattr(n, "search"):
+            pattern = n.pattern if not n.flags & re.IGNORECASE else b"(?i:" + n.pattern + b")"
+        else:
+            pattern = re.escape(n)
+        parts.append(b"(?P<n%d>%s)" % (i, pattern))
+    scan = re.compile(b"|".join(parts))
+
+    found = [False] * len(needles)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return found
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in scan.finditer(mm):
+                found[int(match.lastgroup[1:])] = True
+                if all(found):
+                    break
+    return found
+
+
+# One directory listing answers every top-level "does it exist?" check
+# (scandir also knows each entry's type, so no stat per directory check)
+with os.scandir(".") as it:
+    entries = list(it)
+present = frozenset(entry.name for entry in entries)
+directories = frozenset(entry.name for entry in entries if entry.is_dir())
+
+# Each check returns (title, passed, output lines); they only stat and
+# read files, so they run concurrently and are reported in number order
+
+def check_selenium_setup():
+    # Test 1: Check selenium_setup.py exists
+    if "selenium_setup.py" in present:
+        return "selenium_setup.py", True, ["✓ Found"]
+    return "selenium_setup.py", False, ["✗ NOT FOUND"]
+
+
+def check_dockerfile():
+    # Test 2: Check Dockerfile
+    if "Dockerfile" not in present:
+        return "Dockerfile", False, ["✗ NOT FOUND"]
+    if all(contains("Dockerfile", b"google-chrome", b"chromedriver")):
+        return "Dockerfile", True, ["✓ Found with Chrome + ChromeDriver"]
+    return "Dockerfile", False, ["✗ Missing Chrome/ChromeDriver setup"]
+
+
+def check_requirements():
+    # Test 3: Check requirements.txt
+    if "requirements.txt" not in present:
+        return "requirements.txt", False, ["✗ NOT FOUND"]
+    if contains("requirements.txt", b"webdriver-manager")[0]:
+        return "requirements.txt", False, ["✗ ERROR: webdriver-manager still present!"]
+    return "requirements.txt", True, ["✓ Clean (no webdriver-manager)"]
+
+
+def check_main_files():
+    # Test 4: Check main files
+    ok, lines = True, []
+    for f in ["TICKETER.py", "pdfdata2.py", "TICKETHELPER.html"]:
+        if f in present:
+            lines.append(f"✓ {f}")
+        else:
+            lines.append(f"✗ {f} missing")
+            ok = False
+    return "Main application files", ok, lines
+
+
+def check_ticketer_integration():
+    # Test 5: Check TICKETER.py uses new selenium setup
+    title = "TICKETER.py integration"
+    if "TICKETER.py" not in present:
+        return title, False, ["✗ TICKETER.py not found"]
+    uses_setup, uses_manager = contains(
+        "TICKETER.py", b"from selenium_setup import", re.compile(rb"webdriver_manager", re.IGNORECASE)
+    )
+    ok, lines = True, []
+    if uses_setup:
+        lines.append("✓ Uses selenium_setup")
+    else:
+        lines.append("✗ Still uses old webdriver-manager")
+        ok = False
+    if uses_manager:
+        lines.append("✗ WARNING: Still references webdriver_manager")
+        ok = False
+    return title, ok, lines
+
+
+def check_bonushelper():
+    # Test 6: Check BONUSHELPER
+    title = "BONUSHELPER integration"
+    bonus_auth = "BONUSHELPER/pmm_auth.py"
+    if "BONUSHELPER" not in directories or "pmm_auth.py" not in os.listdir("BONUSHELPER"):
+        return title, True, ["⚠ BONUSHELPER/pmm_auth.py not checked"]
+    if contains(bonus_auth, b"from selenium_setup import")[0]:
+        return title, True, ["✓ BONUSHELPER/pmm_auth.py updated"]
+    return title, False, ["✗ BONUSHELPER/pmm_auth.py still uses webdriver-manager"]
+
+
+def check_directories():
+    # Test 7: Check directories
+    lines = [f"✓ {d}/" if d in directories else f"⚠ {d}/ will be created on first run"
+             for d in ["logs", "screenshots"]]
+    return "Required directories", True, lines
+
+
+def check_config_files():
+    # Test 8: Check configuration files
+    lines = [f"✓ {f}" if f in present else f"⚠ {f} missing (optional)"
+             for f in [".dockerignore", ".gitignore", "railway.json", "README.md"]]
+    return "Configuration files", True, lines
+
+
+CHECKS = (
+    check_selenium_setup,
+    check_dockerfile,
+    check_requirements,
+    check_main_files,
+    check_ticketer_integration,
+    check_bonushelper,
+    check_directories,
+    check_config_files,
+)
 
 print("="*60)
 print("🧪 TICKETER Railway Setup Verification")
 print("="*60)
 
-all_good = True
+with ThreadPoolExecutor(max_workers=len(CHECKS)) as executor:
+    futures = {executor.submit(check): number for number, check in enumerate(CHECKS, 1)}
+    results = sorted((futures[fut], fut.result()) for fut in as_completed(futures))
 
-# Test 1: Check selenium_setup.py exists
-print("\n[1] selenium_setup.py...")
-if os.path.exists("selenium_setup.py"):
-    print("    ✓ Found")
-else:
-    print("    ✗ NOT FOUND")
-    all_good = False
-
-# Test 2: Check Dockerfile
-print("\n[2] Dockerfile...")
-if os.path.exists("Dockerfile"):
-    with open("Dockerfile", "r") as f:
-        content = f.read()
-        if "google-chrome" in content and "chromedriver" in content:
-            print("    ✓ Found with Chrome + ChromeDriver")
-        else:
-            print("    ✗ Missing Chrome/ChromeDriver setup")
-            all_good = False
-else:
-    print("    ✗ NOT FOUND")
-    all_good = False
-
-# Test 3: Check requirements.txt
-print("\n[3] requirements.txt...")
-if os.path.exists("requirements.txt"):
-    with open("requirements.txt", "r") as f:
-        content = f.read()
-        if "webdriver-manager" in content:
-            print("    ✗ ERROR: webdriver-manager still present!")
-            all_good = False
-        else:
-            print("    ✓ Clean (no webdriver-manager)")
-else:
-    print("    ✗ NOT FOUND")
-    all_good = False
-
-# Test 4: Check main files
-print("\n[4] Main application files...")
-files = ["TICKETER.py", "pdfdata2.py", "TICKETHELPER.html"]
-for f in files:
-    if os.path.exists(f):
-        print(f"    ✓ {f}")
-    else:
-        print(f"    ✗ {f} missing")
-        all_good = False
-
-# Test 5: Check TICKETER.py uses new selenium setup
-print("\n[5] TICKETER.py integration...")
-if os.path.exists("TICKETER.py"):
-    with open("TICKETER.py", "r", encoding="utf-8") as f:
-        content = f.read()
-        if "from selenium_setup import" in content:
-            print("    ✓ Uses selenium_setup")
-        else:
-            print("    ✗ Still uses old webdriver-manager")
-            all_good = False
-        
-        if "webdriver_manager" in content.lower():
-            print("    ✗ WARNING: Still references webdriver_manager")
-            all_good = False
-else:
-    print("    ✗ TICKETER.py not found")
-    all_good = False
-
-# Test 6: Check BONUSHELPER
-print("\n[6] BONUSHELPER integration...")
-bonus_auth = "BONUSHELPER/pmm_auth.py"
-if os.path.exists(bonus_auth):
-    with open(bonus_auth, "r", encoding="utf-8") as f:
-        content = f.read()
-        if "from selenium_setup import" in content:
-            print("    ✓ BONUSHELPER/pmm_auth.py updated")
-        else:
-            print("    ✗ BONUSHELPER/pmm_auth.py still uses webdriver-manager")
-            all_good = False
-else:
-    print("    ⚠ BONUSHELPER/pmm_auth.py not checked")
+for number, (title, ok, lines) in results:
+    print(f"\n[{number}] {title}...")
+    for line in lines:
+        print(f"    {line}")
 
-# Test 7: Check directories
-print("\n[7] Required directories...")
-for d in ["logs", "screenshots", "uploads"]:
-    if os.path.exists(d):
-        print(f"    ✓ {d}/")
-    else:
-        print(f"    ⚠ {d}/ will be created on first run")
-
-# Test 8: Check configuration files
-print("\n[8] Configuration files...")
-config_files = [".dockerignore", ".gitignore", "railway.json", "README.md"]
-for f in config_files:
-    if os.path.exists(f):
-        print(f"    ✓ {f}")
-    else:
-        print(f"    ⚠ {f} missing (optional)")
+all_good = all(ok for _, (_, ok, _) in results)
 
 print("\n" + "="*60)
 if all_good: